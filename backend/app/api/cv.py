@@ -2,10 +2,11 @@
 CV Generation API routes.
 Handles JD processing, ATS optimization, and document generation.
 """
+import hashlib
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Header
+from fastapi.responses import FileResponse, Response
 from bson import ObjectId
 import logging
 
@@ -18,7 +19,7 @@ from app.models.schemas import (
     ProfileResponse,
     ATSAnalysis,
 )
-from app.services.llm_service import groq_service
+from app.services.llm_service import get_groq_service
 from app.services.ats_engine import ats_engine
 from app.services.latex_generator import latex_generator
 from app.services.document_compiler import document_compiler
@@ -70,7 +71,7 @@ async def generate_cv(
         
         # Extract keywords from JD using LLM
         logger.info(f"Extracting keywords for user {user_id}")
-        jd_keywords = await groq_service.extract_keywords_from_jd(
+        jd_keywords = await get_groq_service().extract_keywords_from_jd(
             request.job_description
         )
         logger.info(f"Extracted JD keywords: {jd_keywords}")
@@ -165,7 +166,7 @@ async def preview_optimized(
     try:
         profile = await get_user_profile(user_id)
 
-        jd_keywords = await groq_service.extract_keywords_from_jd(request.job_description)
+        jd_keywords = await get_groq_service().extract_keywords_from_jd(request.job_description)
 
         optimized_content = await ats_engine.optimize_profile_for_jd(
             profile=profile,
@@ -203,7 +204,7 @@ async def analyze_ats_compatibility(
     try:
         profile = await get_user_profile(user_id)
         
-        jd_keywords = await groq_service.extract_keywords_from_jd(job_description)
+        jd_keywords = await get_groq_service().extract_keywords_from_jd(job_description)
         
         analysis = await ats_engine.analyze_ats_compatibility(
             profile=profile,
@@ -230,35 +231,91 @@ async def analyze_ats_compatibility(
         )
 
 
+def _history_etag(cv_ids: List[str]) -> str:
+    """ETag over the visible history window; CVs are immutable, so the
+    ordered id list fully determines the payload."""
+    digest = hashlib.blake2b("|".join(cv_ids).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
 @router.get("/history", response_model=List[CVGenerationResponse])
 async def get_cv_history(
+    response: Response,
     limit: int = 10,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get user's CV generation history.
-    
+
     Args:
+        response: Response object for the ETag header
         limit: Maximum number of results
         user_id: Current user ID
-        
+        if_none_match: Optional ETag from a previous fetch
+
     Returns:
-        List of generated CVs
+        List of generated CVs, or 304 when the caller's copy is current
     """
     cvs_collection = get_generated_cvs_collection()
-    
+
+    if if_none_match:
+        # Revalidate against an ids-only projection before paying for
+        # the full documents (each row carries its LaTeX source).
+        id_cursor = cvs_collection.find(
+            {"user_id": user_id},
+            projection={"_id": 1}
+        ).sort("created_at", -1).limit(limit)
+        cv_ids = [str(doc["_id"]) async for doc in id_cursor]
+        if _history_etag(cv_ids) == if_none_match:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": if_none_match}
+            )
+
     cursor = cvs_collection.find(
         {"user_id": user_id}
     ).sort("created_at", -1).limit(limit)
-    
+
     results = []
     async for cv in cursor:
         cv["_id"] = str(cv["_id"])
         results.append(CVGenerationResponse(**cv))
-    
+
+    response.headers["ETag"] = _history_etag([cv.id for cv in results])
     return results
 
 
+@router.get("/history/summary")
+async def get_cv_history_summary(user_id: str = Depends(get_current_user_id)):
+    """
+    Get lightweight history stats for the dashboard.
+    
+    Returns only the CV count and the latest ATS score instead of
+    shipping full CV documents to render two metrics.
+    
+    Args:
+        user_id: Current user ID
+        
+    Returns:
+        Dict with count and latest_ats_score
+    """
+    cvs_collection = get_generated_cvs_collection()
+    
+    count = await cvs_collection.count_documents({"user_id": user_id})
+    latest_score = None
+    if count:
+        latest = await cvs_collection.find_one(
+            {"user_id": user_id},
+            sort=[("created_at", -1)],
+            projection={"ats_score": 1}
+        )
+        if latest:
+            latest_score = latest.get("ats_score")
+    
+    return {"count": count, "latest_ats_score": latest_score}
+
+
 @router.get("/{cv_id}", response_model=CVGenerationResponse)
 async def get_cv(
     cv_id: str,
@@ -325,6 +382,59 @@ async def get_cv_latex(
     )
 
 
+@router.post("/{cv_id}/render-async")
+async def render_cv_async(
+    cv_id: str,
+    fmt: str = "pdf",
+    user_id: str = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Start rendering a CV to PDF or DOCX in the background.
+
+    Args:
+        cv_id: CV document ID
+        fmt: Output format, "pdf" or "docx"
+        user_id: Current user ID
+
+    Returns:
+        Task ID to poll via /tasks/status, or sync-mode marker when no
+        Celery workers are available (callers should fall back to the
+        blocking download endpoints)
+    """
+    from app.services.tasks import (
+        CELERY_AVAILABLE,
+        celery_app,
+        compile_pdf_task,
+        convert_docx_task,
+    )
+
+    if fmt not in ("pdf", "docx"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fmt must be 'pdf' or 'docx'"
+        )
+
+    cvs_collection = get_generated_cvs_collection()
+
+    cv = await cvs_collection.find_one(
+        {"_id": ObjectId(cv_id), "user_id": user_id},
+        projection={"latex_code": 1}
+    )
+
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV not found"
+        )
+
+    if CELERY_AVAILABLE and celery_app:
+        render_task = compile_pdf_task if fmt == "pdf" else convert_docx_task
+        task = render_task.delay(cv["latex_code"], "cv")
+        return {"task_id": task.id, "status": "PENDING"}
+
+    return {"task_id": None, "status": "SYNC"}
+
+
 @router.post("/{cv_id}/compile-pdf")
 async def compile_cv_to_pdf(
     cv_id: str,
@@ -374,31 +484,40 @@ async def compile_cv_to_pdf(
 @router.get("/{cv_id}/download-pdf")
 async def download_cv_pdf(
     cv_id: str,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Download CV as PDF.
-    
+
     Args:
         cv_id: CV document ID
         user_id: Current user ID
-        
+        if_none_match: Optional ETag from a previous download
+
     Returns:
-        PDF file download
+        PDF file download, or 304 when the caller's copy is current
     """
     cvs_collection = get_generated_cvs_collection()
-    
+
     cv = await cvs_collection.find_one({
         "_id": ObjectId(cv_id),
         "user_id": user_id
     })
-    
+
     if not cv:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV not found"
         )
-    
+
+    # CVs are immutable, so the LaTeX digest is a perfect validator:
+    # a matching ETag means the caller's bytes are still current and
+    # the compile can be skipped entirely.
+    etag = f'"{document_compiler.latex_digest(cv["latex_code"])}"'
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     # Compile PDF
     result = await document_compiler.compile_latex_to_pdf(
         latex_code=cv["latex_code"],
@@ -411,21 +530,20 @@ async def download_cv_pdf(
             detail=f"PDF compilation failed: {result.error_message}"
         )
     
-    # Read PDF content
-    pdf_content = document_compiler.read_pdf(result.pdf_path)
-    
-    if not pdf_content:
+    # Stream the PDF via sendfile instead of buffering it in memory
+    pdf_path = document_compiler.open_pdf(result.pdf_path)
+
+    if not pdf_path:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to read PDF file"
         )
-    
-    return Response(
-        content=pdf_content,
+
+    return FileResponse(
+        path=pdf_path,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": "attachment; filename=cv.pdf"
-        }
+        filename="cv.pdf",
+        headers={"ETag": etag}
     )
 
 
@@ -515,50 +633,65 @@ async def download_cv_docx(
             detail=f"DOCX conversion failed: {result.error_message}"
         )
     
-    # Read DOCX content
-    docx_content = document_compiler.read_docx(result.docx_path)
-    
-    if not docx_content:
+    # Stream the DOCX via sendfile instead of buffering it in memory
+    docx_path = document_compiler.open_docx(result.docx_path)
+
+    if not docx_path:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to read DOCX file"
         )
-    
-    return Response(
-        content=docx_content,
+
+    return FileResponse(
+        path=docx_path,
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={
-            "Content-Disposition": "attachment; filename=cv.docx"
-        }
+        filename="cv.docx"
     )
 
 
 @router.delete("/{cv_id}")
 async def delete_cv(
     cv_id: str,
+    history_limit: int = 0,
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Delete a generated CV.
-    
+
     Args:
         cv_id: CV document ID
+        history_limit: When > 0, include the refreshed history (up to
+            this many entries) in the response so callers rendering a
+            list can skip the follow-up fetch
         user_id: Current user ID
-        
+
     Returns:
-        Deletion confirmation
+        Deletion confirmation, optionally with the updated history
     """
     cvs_collection = get_generated_cvs_collection()
-    
+
     result = await cvs_collection.delete_one({
         "_id": ObjectId(cv_id),
         "user_id": user_id
     })
-    
+
     if result.deleted_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV not found"
         )
-    
-    return {"message": "CV deleted successfully"}
+
+    response = {"message": "CV deleted successfully"}
+
+    if history_limit > 0:
+        cursor = cvs_collection.find(
+            {"user_id": user_id}
+        ).sort("created_at", -1).limit(history_limit)
+
+        history = []
+        async for cv in cursor:
+            cv["_id"] = str(cv["_id"])
+            history.append(CVGenerationResponse(**cv))
+        response["history"] = history
+
+    return response
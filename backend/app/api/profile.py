@@ -18,6 +18,7 @@ from app.models.schemas import (
     Project,
     Internship,
     Certification,
+    ProfileBulkPatch,
 )
 
 router = APIRouter(prefix="/profile", tags=["Profile Management"])
@@ -144,6 +145,81 @@ async def update_profile(
     return ProfileResponse(**profile)
 
 
+@router.patch("/bulk", response_model=ProfileResponse)
+async def bulk_update_profile(
+    patch: ProfileBulkPatch,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Apply a batched profile patch in a single write.
+    
+    Replaces N per-section round-trips (e.g. a wizard submitting several
+    education, project and achievement entries) with one request and one
+    database update.
+    
+    Args:
+        patch: Sections to replace (``set``) and entries to append (``add``)
+        user_id: Current user ID
+        
+    Returns:
+        Updated profile
+    """
+    profiles_collection = get_profiles_collection()
+    
+    set_doc = {"updated_at": datetime.utcnow()}
+    push_doc = {}
+    
+    if patch.set:
+        if patch.set.personal_details:
+            set_doc["personal_details"] = patch.set.personal_details.model_dump()
+        if patch.set.education is not None:
+            set_doc["education"] = [edu.model_dump() for edu in patch.set.education]
+        if patch.set.skills:
+            set_doc["skills"] = patch.set.skills.model_dump()
+        if patch.set.projects is not None:
+            set_doc["projects"] = [proj.model_dump() for proj in patch.set.projects]
+        if patch.set.internships is not None:
+            set_doc["internships"] = [intern.model_dump() for intern in patch.set.internships]
+        if patch.set.certifications is not None:
+            set_doc["certifications"] = [cert.model_dump() for cert in patch.set.certifications]
+        if patch.set.achievements is not None:
+            set_doc["achievements"] = patch.set.achievements
+    
+    if patch.add:
+        for field in ("education", "projects", "internships", "certifications"):
+            entries = getattr(patch.add, field)
+            if entries:
+                if field in set_doc:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Cannot both set and add to '{field}' in one patch"
+                    )
+                push_doc[field] = {"$each": [entry.model_dump() for entry in entries]}
+        if patch.add.achievements:
+            if "achievements" in set_doc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot both set and add to 'achievements' in one patch"
+                )
+            push_doc["achievements"] = {"$each": patch.add.achievements}
+    
+    update = {"$set": set_doc}
+    if push_doc:
+        update["$push"] = push_doc
+    
+    result = await profiles_collection.update_one({"user_id": user_id}, update)
+    
+    if result.matched_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    profile = await profiles_collection.find_one({"user_id": user_id})
+    profile["_id"] = str(profile["_id"])
+    return ProfileResponse(**profile)
+
+
 # ============== Education Endpoints ==============
 
 @router.post("/education", response_model=ProfileResponse)
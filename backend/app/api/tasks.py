@@ -4,10 +4,12 @@ Background task API routes.
 Note: When Celery is not available, tasks run synchronously.
 """
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import FileResponse
 from typing import Dict, Any
 import uuid
 
 from app.core.dependencies import get_current_user_id
+from app.services.document_compiler import document_compiler
 from app.services.tasks import (
     CELERY_AVAILABLE,
     celery_app,
@@ -139,3 +141,62 @@ async def get_task_status_endpoint(
         Task status and result
     """
     return get_task_status(task_id)
+
+
+@router.get("/download/{task_id}")
+async def download_task_result(
+    task_id: str,
+    fmt: str = "pdf",
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Download the file produced by a finished render task.
+
+    Args:
+        task_id: Task ID of a compile-pdf or convert-docx task
+        fmt: Output format, "pdf" or "docx"
+        user_id: Current user ID
+
+    Returns:
+        The rendered file
+    """
+    if fmt not in ("pdf", "docx"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fmt must be 'pdf' or 'docx'"
+        )
+
+    task_info = get_task_status(task_id)
+
+    if not task_info["ready"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task is still running"
+        )
+
+    result = task_info.get("result")
+    if not isinstance(result, dict) or not result.get("success"):
+        error = result.get("error") if isinstance(result, dict) else None
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error or "Render task failed"
+        )
+
+    if fmt == "pdf":
+        file_path = document_compiler.open_pdf(result.get("pdf_path", ""))
+        media_type = "application/pdf"
+    else:
+        file_path = document_compiler.open_docx(result.get("docx_path", ""))
+        media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rendered file is no longer available"
+        )
+
+    return FileResponse(
+        path=file_path,
+        media_type=media_type,
+        filename=f"cv.{fmt}"
+    )
@@ -36,8 +36,10 @@ class Settings(BaseSettings):
     # Groq API
     GROQ_API_KEY: str = Field(..., description="Groq API key")
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_FAST_MODEL: str = "llama-3.1-8b-instant"  # Cheap model for structured extraction
     GROQ_TEMPERATURE: float = 0.0  # Deterministic outputs
     GROQ_MAX_TOKENS: int = 4096
+    GROQ_MAX_CONCURRENCY: int = 4  # Concurrent Groq requests (TPM/RPM headroom)
     
     # Redis (for Celery)
     REDIS_URL: str = "redis://localhost:6379/0"
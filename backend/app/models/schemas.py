@@ -182,6 +182,27 @@ class ProfileUpdate(BaseModel):
     achievements: Optional[List[str]] = None
 
 
+class ProfileBulkAppend(BaseModel):
+    """Entries to append to list sections in a bulk patch."""
+    education: List[Education] = Field(default_factory=list)
+    projects: List[Project] = Field(default_factory=list)
+    internships: List[Internship] = Field(default_factory=list)
+    certifications: List[Certification] = Field(default_factory=list)
+    achievements: List[str] = Field(default_factory=list)
+
+
+class ProfileBulkPatch(BaseModel):
+    """
+    Schema for a batched profile patch.
+    
+    ``set`` replaces whole sections (same semantics as PUT /profile/),
+    ``add`` appends entries to list sections. Both are applied in a
+    single database write so a multi-section save costs one round-trip.
+    """
+    set: Optional[ProfileUpdate] = None
+    add: Optional[ProfileBulkAppend] = None
+
+
 class ProfileResponse(BaseModel):
     """Schema for profile response."""
     id: Optional[str] = Field(default=None, alias="_id")
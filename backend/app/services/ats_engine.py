@@ -3,15 +3,21 @@ ATS (Applicant Tracking System) Optimization Engine.
 Implements hybrid rule-based and AI-based ATS optimization.
 """
 import re
+import asyncio
 import logging
 from typing import List, Dict, Any, Tuple, Optional, Set
 from collections import Counter
 
-from app.services.llm_service import groq_service
+from app.services.llm_service import get_groq_service
 from app.models.schemas import ProfileResponse
 
 logger = logging.getLogger(__name__)
 
+# Common words ignored by the keyword-stuffing check
+_STUFFING_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with"
+})
+
 # Common English stop words for keyword extraction
 STOP_WORDS = {
     'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
@@ -152,26 +158,39 @@ class ATSOptimizationEngine:
         "dotnet": [".net"],
     }
     
-    def _normalize_keyword(self, keyword: str) -> str:
+    # Normalized term -> frozenset of its full synonym group; built once
+    # per process on first use instead of rescanning TECH_SYNONYMS (with
+    # re-normalization of every synonym list) on every lookup
+    _variant_index: Optional[Dict[str, frozenset]] = None
+    
+    @staticmethod
+    def _normalize_keyword(keyword: str) -> str:
         """Normalize a keyword for comparison."""
         return keyword.lower().strip().replace("-", " ").replace("_", " ")
     
+    @classmethod
+    def _build_variant_index(cls) -> Dict[str, frozenset]:
+        """Precompute the normalized synonym groups."""
+        normalize = cls._normalize_keyword
+        index: Dict[str, frozenset] = {}
+        for base, syns in cls.TECH_SYNONYMS.items():
+            group = {normalize(base)}
+            group.update(normalize(s) for s in syns)
+            frozen = frozenset(group)
+            for term in group:
+                # A term can belong to several groups; merge them
+                existing = index.get(term)
+                index[term] = existing | frozen if existing else frozen
+        cls._variant_index = index
+        return index
+    
     def _get_keyword_variants(self, keyword: str) -> set:
         """Get all variants of a keyword including synonyms."""
+        index = ATSOptimizationEngine._variant_index
+        if index is None:
+            index = self._build_variant_index()
         normalized = self._normalize_keyword(keyword)
-        variants = {normalized}
-        
-        # Add synonyms
-        if normalized in self.TECH_SYNONYMS:
-            variants.update(self._normalize_keyword(s) for s in self.TECH_SYNONYMS[normalized])
-        
-        # Also check if any synonym maps to this keyword
-        for base, syns in self.TECH_SYNONYMS.items():
-            if normalized in [self._normalize_keyword(s) for s in syns]:
-                variants.add(self._normalize_keyword(base))
-                variants.update(self._normalize_keyword(s) for s in syns)
-        
-        return variants
+        return index.get(normalized) or {normalized}
     
     def _calculate_keyword_match(
         self,
@@ -193,6 +212,9 @@ class ATSOptimizationEngine:
             profile_normalized.add(normalized)
             profile_variants.update(self._get_keyword_variants(kw))
         
+        # Length filter hoisted out of the per-JD-keyword loop
+        substring_variants = [pv for pv in profile_variants if len(pv) > 2]
+        
         matched = []
         missing = []
         
@@ -204,7 +226,7 @@ class ATSOptimizationEngine:
             if jd_variants.intersection(profile_variants):
                 matched.append(jd_kw)
             # Also check for substring matches (e.g., "python developer" contains "python")
-            elif any(jd_normalized in pv or pv in jd_normalized for pv in profile_variants if len(pv) > 2):
+            elif any(jd_normalized in pv or pv in jd_normalized for pv in substring_variants):
                 matched.append(jd_kw)
             else:
                 missing.append(jd_kw)
@@ -215,61 +237,63 @@ class ATSOptimizationEngine:
     
     def _analyze_bullet_length(self, bullets: List[str]) -> Dict[str, Any]:
         """Analyze bullet points for optimal length."""
-        analysis = {
-            "total_bullets": len(bullets),
-            "optimal_bullets": 0,
-            "too_short": 0,
-            "too_long": 0,
-            "bullet_details": []
-        }
+        # Local counters and bound constants: each dict item increment in
+        # the old loop was a hash + getitem + setitem per bullet
+        min_words = self.BULLET_MIN_WORDS
+        max_words = self.BULLET_MAX_WORDS
+        optimal = too_short = too_long = 0
+        details = []
         
         for bullet in bullets:
             word_count = len(bullet.split())
-            status = "optimal"
             
-            if word_count < self.BULLET_MIN_WORDS:
-                analysis["too_short"] += 1
+            if word_count < min_words:
+                too_short += 1
                 status = "too_short"
-            elif word_count > self.BULLET_MAX_WORDS:
-                analysis["too_long"] += 1
+            elif word_count > max_words:
+                too_long += 1
                 status = "too_long"
             else:
-                analysis["optimal_bullets"] += 1
+                optimal += 1
+                status = "optimal"
             
-            analysis["bullet_details"].append({
+            details.append({
                 "text": bullet[:50] + "..." if len(bullet) > 50 else bullet,
                 "word_count": word_count,
                 "status": status
             })
         
-        analysis["bullet_score"] = (
-            analysis["optimal_bullets"] / analysis["total_bullets"] * 100
-            if analysis["total_bullets"] > 0 else 0
-        )
-        
-        return analysis
+        total = len(bullets)
+        return {
+            "total_bullets": total,
+            "optimal_bullets": optimal,
+            "too_short": too_short,
+            "too_long": too_long,
+            "bullet_details": details,
+            "bullet_score": optimal / total * 100 if total > 0 else 0
+        }
     
     def _check_keyword_stuffing(self, text: str) -> Dict[str, Any]:
         """Check for keyword stuffing."""
         words = text.lower().split()
         word_freq = Counter(words)
-        
-        # Filter out common words
-        stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with"}
-        word_freq = {k: v for k, v in word_freq.items() if k not in stop_words and len(k) > 2}
-        
-        # Calculate total word count
         total_words = len(words)
         
-        # Check for suspicious repetition (same word appearing more than 3% of total)
+        # "More than 3% of total" as an absolute count, so the common-case
+        # words are rejected with one comparison instead of a division
+        count_threshold = max(3, total_words * 0.03)
+        
         stuffed_keywords = []
         for word, count in word_freq.items():
-            frequency = count / total_words * 100
-            if frequency > 3 and count > 3:
+            if (
+                count > count_threshold
+                and len(word) > 2
+                and word not in _STUFFING_STOP_WORDS
+            ):
                 stuffed_keywords.append({
                     "word": word,
                     "count": count,
-                    "frequency": round(frequency, 2)
+                    "frequency": round(count / total_words * 100, 2)
                 })
         
         return {
@@ -643,41 +667,98 @@ class ATSOptimizationEngine:
             jd_keywords.get("technologies", [])
         )
         
-        # Generate professional summary tailored to the JD
-        try:
-            profile_data = {
-                "skills": {
-                    "programming_languages": profile.skills.programming_languages,
-                    "technical_skills": profile.skills.technical_skills,
-                    "developer_tools": profile.skills.developer_tools
-                },
-                "projects": [{"project_name": p.project_name, "tech_stack": p.tech_stack} for p in profile.projects],
-                "internships": [{"company_name": i.company_name, "internship_name": i.internship_name} for i in profile.internships]
+        # Pre-filter once so the optimization loops only touch entries
+        # that actually have bullets to rewrite (common during onboarding
+        # profiles with many empty sections).
+        projects_with_bullets = [p for p in profile.projects if p.bullet_points]
+        internships_with_bullets = [i for i in profile.internships if i.bullet_points]
+
+        profile_data = {
+            "skills": {
+                "programming_languages": profile.skills.programming_languages,
+                "technical_skills": profile.skills.technical_skills,
+                "developer_tools": profile.skills.developer_tools
+            },
+            "projects": [{"project_name": p.project_name, "tech_stack": p.tech_stack} for p in profile.projects],
+            "internships": [{"company_name": i.company_name, "internship_name": i.internship_name} for i in profile.internships]
+        }
+        profile_skills = profile_data["skills"]
+
+        groq_service = get_groq_service()
+
+        # All bullet rewrites go out as ONE batched LLM call; the summary
+        # and skills calls run concurrently with it via asyncio.gather, so
+        # the whole optimization costs a single round of Groq latency.
+        bullet_groups = [
+            {
+                "id": f"project:{project.project_name}",
+                "bullets": project.bullet_points,
+                "target_keywords": target_keywords[:10],
+                "context": f"Project: {project.project_name}, Tech Stack: {', '.join(project.tech_stack)}"
             }
-            
-            summary = await groq_service.generate_professional_summary(
+            for project in projects_with_bullets
+        ] + [
+            {
+                "id": f"internship:{internship.internship_name}",
+                "bullets": internship.bullet_points,
+                "target_keywords": target_keywords[:10],
+                "context": f"Internship: {internship.internship_name} at {internship.company_name}"
+            }
+            for internship in internships_with_bullets
+        ]
+
+        # Summary + skills optimization are fused into one LLM call that
+        # runs concurrently with the batched bullet rewrite, so the whole
+        # leg costs two requests instead of four.
+        analysis_result, bullets_result = await asyncio.gather(
+            groq_service.analyze_profile_for_jd(
+                profile_skills=profile_skills,
                 profile_data=profile_data,
-                job_description=job_description,
-                jd_keywords=jd_keywords
-            )
-            optimized["professional_summary"] = summary
-            logger.info(f"Generated professional summary: {summary[:100]}...")
-        except Exception as e:
-            logger.error(f"Error generating professional summary: {e}")
+                jd_keywords=jd_keywords,
+                job_description=job_description
+            ),
+            groq_service.rewrite_bullets_batch(bullet_groups),
+            return_exceptions=True
+        )
+
+        if isinstance(analysis_result, Exception):
+            summary_result: Any = analysis_result
+            skills_result: Any = analysis_result
+        else:
+            summary_result = analysis_result.get("summary", "")
+            skills_result = analysis_result.get("optimized_skills", {})
+
+        if isinstance(bullets_result, Exception):
+            logger.error(f"Error rewriting bullet groups: {bullets_result}")
+            bullets_result = {}
+
+        project_results = [
+            bullets_result.get(f"project:{project.project_name}")
+            for project in projects_with_bullets
+        ]
+        internship_results = [
+            bullets_result.get(f"internship:{internship.internship_name}")
+            for internship in internships_with_bullets
+        ]
+
+        # Professional summary tailored to the JD
+        if isinstance(summary_result, Exception):
+            logger.error(f"Error generating professional summary: {summary_result}")
             optimized["professional_summary"] = ""
-        
-        # Optimize skills order and add relevant keywords
-        try:
-            profile_skills = {
+        else:
+            optimized["professional_summary"] = summary_result
+            logger.info(f"Generated professional summary: {summary_result[:100]}...")
+
+        # Optimized skills order and relevant keywords
+        if isinstance(skills_result, Exception):
+            logger.error(f"Error optimizing skills: {skills_result}")
+            optimized["skills"] = {
                 "programming_languages": profile.skills.programming_languages,
                 "technical_skills": profile.skills.technical_skills,
                 "developer_tools": profile.skills.developer_tools
             }
-            
-            optimized_skills = await groq_service.optimize_skills_for_jd(
-                profile_skills=profile_skills,
-                jd_keywords=jd_keywords
-            )
+        else:
+            optimized_skills = skills_result
             # Store optimized skills returned by LLM
             optimized["skills"] = optimized_skills
 
@@ -711,59 +792,40 @@ class ATSOptimizationEngine:
             optimized["injected_keywords"] = list(set(optimized["injected_keywords"]))
 
             logger.info(f"Optimized skills with prioritized keywords; added skills: {skills_added}")
-        except Exception as e:
-            logger.error(f"Error optimizing skills: {e}")
-            optimized["skills"] = {
-                "programming_languages": profile.skills.programming_languages,
-                "technical_skills": profile.skills.technical_skills,
-                "developer_tools": profile.skills.developer_tools
-            }
-        
-        # Optimize project bullets
-        for project in profile.projects:
-            if project.bullet_points:
-                try:
-                    result = await groq_service.rewrite_bullets(
-                        bullets=project.bullet_points,
-                        target_keywords=target_keywords[:10],
-                        context=f"Project: {project.project_name}, Tech Stack: {', '.join(project.tech_stack)}"
-                    )
-                    optimized["projects"].append({
-                        "project_name": project.project_name,
-                        "original_bullets": project.bullet_points,
-                        "optimized_bullets": result.get("rewritten_bullets", project.bullet_points),
-                        "keywords_injected": result.get("keywords_injected", [])
-                    })
-                    optimized["injected_keywords"].extend(result.get("keywords_injected", []))
-                except Exception as e:
-                    logger.error(f"Error optimizing project bullets: {e}")
-                    optimized["projects"].append({
-                        "project_name": project.project_name,
-                        "original_bullets": project.bullet_points,
-                        "optimized_bullets": project.bullet_points,
-                        "keywords_injected": []
-                    })
-        
-        # Optimize internship bullets
-        for internship in profile.internships:
-            if internship.bullet_points:
-                try:
-                    result = await groq_service.rewrite_bullets(
-                        bullets=internship.bullet_points,
-                        target_keywords=target_keywords[:10],
-                        context=f"Internship: {internship.internship_name} at {internship.company_name}"
-                    )
-                    optimized["internships"].append({
-                        "internship_name": internship.internship_name,
-                        "company_name": internship.company_name,
-                        "original_bullets": internship.bullet_points,
-                        "optimized_bullets": result.get("rewritten_bullets", internship.bullet_points),
-                        "keywords_injected": result.get("keywords_injected", [])
-                    })
-                    optimized["injected_keywords"].extend(result.get("keywords_injected", []))
-                except Exception as e:
-                    logger.error(f"Error optimizing internship bullets: {e}")
-        
+
+        # Optimized project bullets
+        for project, result in zip(projects_with_bullets, project_results):
+            if result is None:
+                logger.warning(f"No rewritten bullets returned for project {project.project_name}")
+                optimized["projects"].append({
+                    "project_name": project.project_name,
+                    "original_bullets": project.bullet_points,
+                    "optimized_bullets": project.bullet_points,
+                    "keywords_injected": []
+                })
+            else:
+                optimized["projects"].append({
+                    "project_name": project.project_name,
+                    "original_bullets": project.bullet_points,
+                    "optimized_bullets": result.get("rewritten_bullets", project.bullet_points),
+                    "keywords_injected": result.get("keywords_injected", [])
+                })
+                optimized["injected_keywords"].extend(result.get("keywords_injected", []))
+
+        # Optimized internship bullets
+        for internship, result in zip(internships_with_bullets, internship_results):
+            if result is None:
+                logger.warning(f"No rewritten bullets returned for internship {internship.internship_name}")
+            else:
+                optimized["internships"].append({
+                    "internship_name": internship.internship_name,
+                    "company_name": internship.company_name,
+                    "original_bullets": internship.bullet_points,
+                    "optimized_bullets": result.get("rewritten_bullets", internship.bullet_points),
+                    "keywords_injected": result.get("keywords_injected", [])
+                })
+                optimized["injected_keywords"].extend(result.get("keywords_injected", []))
+
         # Remove duplicate injected keywords
         optimized["injected_keywords"] = list(set(optimized["injected_keywords"]))
         
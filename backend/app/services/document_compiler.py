@@ -3,7 +3,8 @@ Document compilation service for PDF and DOCX generation.
 Uses a remote LaTeX API for cloud-based compilation (no local LaTeX needed).
 """
 import os
-import uuid
+import re
+import hashlib
 import shutil
 import asyncio
 import tempfile
@@ -20,6 +21,10 @@ logger = logging.getLogger(__name__)
 # Free LaTeX compilation API (no auth required)
 LATEX_API_URL = "https://latex.ytotech.com/builds/sync"
 
+# Matches pdflatex error lines ("! ..." or anything mentioning "Error")
+# in a single C-level scan over the compilation log.
+_ERROR_LINE_RE = re.compile(r"^(?:!.*|.*Error.*)$", re.MULTILINE)
+
 
 class DocumentCompiler:
     """
@@ -30,11 +35,33 @@ class DocumentCompiler:
     def __init__(self):
         """Initialize the document compiler."""
         self.latex_timeout = settings.LATEX_TIMEOUT
-        self.temp_base_dir = Path(settings.LATEX_TEMP_DIR)
-        
+        self.temp_base_dir = self._resolve_temp_dir()
+
         # Ensure temp directory exists
         self.temp_base_dir.mkdir(parents=True, exist_ok=True)
-    
+
+    @staticmethod
+    def _resolve_temp_dir() -> Path:
+        """
+        Resolve the base directory for generated artifacts.
+
+        Generated PDFs are short-lived scratch files, so when the default
+        disk-backed temp dir is configured and a writable tmpfs is
+        available, stage them on /dev/shm instead — every write becomes
+        a memcpy rather than a disk I/O.
+        """
+        configured = Path(settings.LATEX_TEMP_DIR)
+        if settings.LATEX_TEMP_DIR == "/tmp/latex":
+            shm = Path("/dev/shm")
+            if shm.is_dir() and os.access(shm, os.W_OK):
+                return shm / "latex"
+        return configured
+
+    @staticmethod
+    def latex_digest(latex_code: str) -> str:
+        """Stable content digest of LaTeX source; doubles as the HTTP ETag."""
+        return hashlib.blake2b(latex_code.encode(), digest_size=16).hexdigest()
+
     async def compile_latex_to_pdf(
         self,
         latex_code: str,
@@ -51,6 +78,24 @@ class DocumentCompiler:
             PDFCompilationResult with success status and path or error
         """
         try:
+            # Identical LaTeX produces an identical PDF, so output files
+            # are keyed by a digest of the source: a repeat compile of
+            # unchanged code is served straight from disk instead of
+            # going back to the remote API.
+            digest = self.latex_digest(latex_code)
+            output_dir = self.temp_base_dir / "output"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            final_pdf = output_dir / f"{digest}_{output_filename}.pdf"
+
+            if final_pdf.is_file():
+                logger.info(f"PDF served from compile cache: {final_pdf}")
+                return PDFCompilationResult(
+                    success=True,
+                    pdf_path=str(final_pdf),
+                    error_message=None,
+                    compilation_log=None
+                )
+
             # Prepare API request payload
             payload = {
                 "compiler": "pdflatex",
@@ -96,9 +141,9 @@ class DocumentCompiler:
                     
                     # Extract error lines from logs
                     if logs:
-                        error_lines = [l for l in logs.split('\n') if l.startswith('!') or 'Error' in l]
+                        error_lines = _ERROR_LINE_RE.findall(logs)[:10]
                         if error_lines:
-                            error_msg = '\n'.join(error_lines[:10])
+                            error_msg = '\n'.join(error_lines)
                     
                     return PDFCompilationResult(
                         success=False,
@@ -112,11 +157,7 @@ class DocumentCompiler:
                         compilation_log=None
                     )
             
-            # Save PDF to output directory
-            output_dir = self.temp_base_dir / "output"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            final_pdf = output_dir / f"{uuid.uuid4()}_{output_filename}.pdf"
+            # Save PDF under its digest-keyed name
             final_pdf.write_bytes(response.content)
             
             logger.info(f"PDF compiled successfully: {final_pdf}")
@@ -173,6 +214,40 @@ class DocumentCompiler:
             error_message="DOCX conversion is not available in cloud deployment. Please download the PDF instead."
         )
     
+    def open_pdf(self, pdf_path: str) -> Optional[Path]:
+        """
+        Resolve a PDF path for streaming.
+
+        Returns the Path for handing to FileResponse (which streams via
+        sendfile instead of buffering the file on the Python heap), or
+        None if the file is missing.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            Path to the PDF, or None if not found
+        """
+        path = Path(pdf_path)
+        if path.exists() and path.suffix == '.pdf':
+            return path
+        return None
+
+    def open_docx(self, docx_path: str) -> Optional[Path]:
+        """
+        Resolve a DOCX path for streaming.
+
+        Args:
+            docx_path: Path to DOCX file
+
+        Returns:
+            Path to the DOCX, or None if not found
+        """
+        path = Path(docx_path)
+        if path.exists() and path.suffix == '.docx':
+            return path
+        return None
+
     def read_pdf(self, pdf_path: str) -> Optional[bytes]:
         """
         Read PDF file contents.
@@ -222,26 +297,56 @@ class DocumentCompiler:
             Number of files deleted
         """
         import time
-        
-        deleted = 0
+        from concurrent.futures import ThreadPoolExecutor
+
         output_dir = self.temp_base_dir / "output"
-        
+
         if not output_dir.exists():
             return 0
-        
+
         max_age_seconds = max_age_hours * 3600
         current_time = time.time()
-        
-        for file_path in output_dir.iterdir():
+
+        # os.scandir yields cached stat results, avoiding a Path object
+        # and a second stat() syscall per entry.
+        expired = []
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                try:
+                    if current_time - entry.stat(follow_symlinks=False).st_mtime > max_age_seconds:
+                        expired.append(entry.path)
+                except OSError as e:
+                    logger.warning(f"Failed to stat {entry.path}: {e}")
+
+        if not expired:
+            return 0
+
+        # unlink(2) releases the GIL, so a small pool overlaps the syscalls
+        def _unlink(path: str) -> int:
             try:
-                if current_time - file_path.stat().st_mtime > max_age_seconds:
-                    file_path.unlink()
-                    deleted += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {file_path}: {e}")
-        
+                os.unlink(path)
+                return 1
+            except OSError as e:
+                logger.warning(f"Failed to delete {path}: {e}")
+                return 0
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            deleted = sum(executor.map(_unlink, expired))
+
         return deleted
 
+    async def cleanup_old_files_async(self, max_age_hours: int = 24) -> int:
+        """
+        Run cleanup_old_files off the event loop thread.
+
+        Args:
+            max_age_hours: Maximum age of files to keep
+
+        Returns:
+            Number of files deleted
+        """
+        return await asyncio.to_thread(self.cleanup_old_files, max_age_hours)
+
 
 # Singleton instance
 document_compiler = DocumentCompiler()
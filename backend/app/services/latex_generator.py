@@ -4,15 +4,89 @@ Generates ATS-optimized LaTeX code from user profile and JD optimization.
 """
 import os
 import re
+import json
 import logging
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
 from pathlib import Path
 
 from app.models.schemas import ProfileResponse
 
 logger = logging.getLogger(__name__)
 
+# Detects any LaTeX-special character; used to skip escaping entirely for
+# clean strings (names, plain tech tokens), which are the common case.
+_LATEX_SPECIAL_RE = re.compile(r'[&%$#_{}~^\\]')
+
+# Single pattern for LaTeX cleanup: trailing whitespace on a line, or a
+# run of 3+ newlines to collapse. One scan replaces sub + split + join.
+_CLEANUP_RE = re.compile(r'[ \t]+$|\n{3,}', re.MULTILINE)
+
+
+def _cleanup_replacement(match: "re.Match[str]") -> str:
+    """Drop trailing whitespace; collapse blank-line runs to one."""
+    return '' if match.group(0)[0] != '\n' else '\n\n'
+
+
+# Ordered (token, priority) pairs for ranking education entries; most
+# specific tokens first so e.g. "senior secondary" wins over "secondary".
+_EDUCATION_PRIORITY_TABLE = (
+    ("phd", 100), ("doctorate", 100),
+    ("mtech", 95), ("m.tech", 95),
+    ("mca", 90), ("master of computer", 90),
+    ("mba", 88), ("master of business", 88),
+    ("msc", 85), ("m.sc", 85), ("master of science", 85),
+    ("master", 80),
+    ("btech", 75), ("b.tech", 75),
+    ("bca", 70), ("bachelor of computer", 70),
+    ("bba", 68), ("bachelor of business", 68),
+    ("bsc", 65), ("b.sc", 65), ("bachelor of science", 65),
+    ("bachelor", 60),
+    ("diploma", 50),
+    ("xii", 40), ("12th", 40), ("12", 40),
+    ("senior secondary", 40), ("intermediate", 40),
+    ("10th", 30), ("10", 30), ("secondary", 30), ("matriculation", 30),
+)
+
+_DEFAULT_EDUCATION_PRIORITY = 20
+
+# Unescaped special characters outside commands (validate_latex)
+_UNESCAPED_SPECIAL_RE = re.compile(r'(?<!\\)[&%$#](?!\w)')
+
+
+def _get_education_priority(degree: str) -> int:
+    """Map a degree name to its ordering priority (higher = first)."""
+    degree_lower = degree.lower()
+    for token, priority in _EDUCATION_PRIORITY_TABLE:
+        if token in degree_lower:
+            return priority
+    return _DEFAULT_EDUCATION_PRIORITY
+
+
+def _escape_match(match: "re.Match[str]") -> str:
+    """Look up the LaTeX escape for one matched special character."""
+    return LaTeXGenerator.LATEX_ESCAPE_MAP[match.group(0)]
+
+
+@lru_cache(maxsize=2048)
+def _escape_latex_cached(text: str) -> str:
+    """
+    Escape one string, memoized for repeated tokens.
+
+    Profile data funnels the same small strings (tech tags, institution
+    names) through escaping many times per CV; repeat calls become a
+    dict lookup.
+
+    Strings that reach the slow path have at least one special character
+    but usually few; a single-alternation regex dispatch benchmarks
+    faster than str.translate for that shape of input.
+    """
+    if not _LATEX_SPECIAL_RE.search(text):
+        return text
+    return _LATEX_SPECIAL_RE.sub(_escape_match, text)
+
 
 class LaTeXGenerator:
     """Generator for ATS-optimized LaTeX CVs."""
@@ -30,7 +104,7 @@ class LaTeXGenerator:
         '^': r'\textasciicircum{}',
         '\\': r'\textbackslash{}',
     }
-    
+
     def __init__(self):
         """Initialize the LaTeX generator with Jinja2 environment."""
         template_dir = Path(__file__).parent.parent / "templates"
@@ -45,12 +119,29 @@ class LaTeXGenerator:
             comment_start_string='<#',
             comment_end_string='#>',
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,  # Templates don't change at runtime
+            cache_size=-1  # Unbounded: the template set is small and fixed
         )
-        
+
         # Register custom filters
         self.env.filters['latex_escape'] = self.escape_latex
         # Don't override the built-in join filter - it works correctly
+
+        # Compiled templates cached per name to skip env lookups per render
+        self._template_cache: Dict[str, Any] = {}
+
+        # Bounded cache of prepared template data keyed by input fingerprint;
+        # regenerating the same profile (preview -> download) skips the
+        # whole escape/sort pipeline.
+        self._profile_data_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+        # Warm the default template so the first request doesn't pay the
+        # parse/compile cost; tolerate its absence (e.g. minimal deploys).
+        try:
+            self._template_cache["cv_template.tex"] = self.env.get_template("cv_template.tex")
+        except TemplateNotFound:
+            logger.debug("Default CV template not found; skipping warm-up")
     
     def escape_latex(self, text: str) -> str:
         """
@@ -66,117 +157,105 @@ class LaTeXGenerator:
             return ""
         
         # Handle URLs specially (don't escape within \href{})
-        text = str(text)
-        
-        # Escape special characters
-        for char, escape in self.LATEX_ESCAPE_MAP.items():
-            if char == '\\':
-                continue  # Handle backslash first
-            text = text.replace(char, escape)
-        
-        return text
+        return _escape_latex_cached(str(text))
     
+    _PROFILE_DATA_CACHE_SIZE = 32
+
     def _prepare_profile_data(
         self,
         profile: ProfileResponse,
         optimized_content: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        Prepare profile data for LaTeX template.
-        
+        Prepare profile data for LaTeX template, memoized by inputs.
+
         Args:
             profile: User profile data
             optimized_content: Optional optimized content from ATS engine
-            
+
         Returns:
             Template-ready data dictionary
         """
+        key = hash((
+            profile.model_dump_json(),
+            json.dumps(optimized_content, sort_keys=True, default=str)
+            if optimized_content else None
+        ))
+
+        cached = self._profile_data_cache.get(key)
+        if cached is not None:
+            self._profile_data_cache.move_to_end(key)
+            return cached
+
+        data = self._build_profile_data(profile, optimized_content)
+
+        self._profile_data_cache[key] = data
+        if len(self._profile_data_cache) > self._PROFILE_DATA_CACHE_SIZE:
+            self._profile_data_cache.popitem(last=False)
+
+        return data
+
+    def _build_profile_data(
+        self,
+        profile: ProfileResponse,
+        optimized_content: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the template-ready data dictionary (uncached path).
+
+        Args:
+            profile: User profile data
+            optimized_content: Optional optimized content from ATS engine
+
+        Returns:
+            Template-ready data dictionary
+        """
+        esc = self.escape_latex  # Local binding for the hot comprehensions
+        pd = profile.personal_details
+
         # Flat personal details
-        full_name = self.escape_latex(profile.personal_details.full_name)
-        location = self.escape_latex(profile.personal_details.location)
-        phone = self.escape_latex(profile.personal_details.phone)
-        email = profile.personal_details.email  # Don't escape email
-        linkedin = profile.personal_details.linkedin  # URLs not escaped
-        github = profile.personal_details.github
+        full_name = esc(pd.full_name)
+        location = esc(pd.location)
+        phone = esc(pd.phone)
+        email = pd.email  # Don't escape email
+        linkedin = pd.linkedin  # URLs not escaped
+        github = pd.github
         
         # Professional summary (from optimized content)
         professional_summary = ""
         if optimized_content and optimized_content.get("professional_summary"):
-            professional_summary = self.escape_latex(optimized_content["professional_summary"])
+            professional_summary = esc(optimized_content["professional_summary"])
         
         # Prepare technical skills as dict for items() iteration
         if optimized_content and optimized_content.get("skills") and optimized_content["skills"].get("programming_languages"):
             technical_skills = {
-                "Programming Languages": [
-                    self.escape_latex(s) for s in optimized_content["skills"].get("programming_languages", [])
-                ],
-                "Technical Skills": [
-                    self.escape_latex(s) for s in optimized_content["skills"].get("technical_skills", [])
-                ],
-                "Tools & Platforms": [
-                    self.escape_latex(s) for s in optimized_content["skills"].get("developer_tools", [])
-                ],
+                "Programming Languages": list(map(esc, optimized_content["skills"].get("programming_languages", []))),
+                "Technical Skills": list(map(esc, optimized_content["skills"].get("technical_skills", []))),
+                "Tools & Platforms": list(map(esc, optimized_content["skills"].get("developer_tools", []))),
             }
         else:
             technical_skills = {
-                "Programming Languages": [
-                    self.escape_latex(s) for s in profile.skills.programming_languages
-                ],
-                "Technical Skills": [
-                    self.escape_latex(s) for s in profile.skills.technical_skills
-                ],
-                "Tools & Platforms": [
-                    self.escape_latex(s) for s in profile.skills.developer_tools
-                ],
+                "Programming Languages": list(map(esc, profile.skills.programming_languages)),
+                "Technical Skills": list(map(esc, profile.skills.technical_skills)),
+                "Tools & Platforms": list(map(esc, profile.skills.developer_tools)),
             }
         
         # Remove empty skill categories
         technical_skills = {k: v for k, v in technical_skills.items() if v}
         
-        # Education priority mapping (higher = appears first)
-        def get_education_priority(degree: str) -> int:
-            degree_lower = degree.lower()
-            if "phd" in degree_lower or "doctorate" in degree_lower:
-                return 100
-            elif "mtech" in degree_lower or "m.tech" in degree_lower:
-                return 95
-            elif "mca" in degree_lower or "master of computer" in degree_lower:
-                return 90
-            elif "mba" in degree_lower or "master of business" in degree_lower:
-                return 88
-            elif "msc" in degree_lower or "m.sc" in degree_lower or "master of science" in degree_lower:
-                return 85
-            elif "master" in degree_lower:
-                return 80
-            elif "btech" in degree_lower or "b.tech" in degree_lower:
-                return 75
-            elif "bca" in degree_lower or "bachelor of computer" in degree_lower:
-                return 70
-            elif "bba" in degree_lower or "bachelor of business" in degree_lower:
-                return 68
-            elif "bsc" in degree_lower or "b.sc" in degree_lower or "bachelor of science" in degree_lower:
-                return 65
-            elif "bachelor" in degree_lower:
-                return 60
-            elif "diploma" in degree_lower:
-                return 50
-            elif "xii" in degree_lower or "12th" in degree_lower or "12" in degree_lower or "senior secondary" in degree_lower or "intermediate" in degree_lower:
-                return 40
-            elif "x" in degree_lower or "10th" in degree_lower or "10" in degree_lower or "secondary" in degree_lower or "matriculation" in degree_lower:
-                return 30
-            else:
-                return 20
-        
         # Prepare education as dynamic list
         education = []
         for edu in profile.education:
             degree_lower = edu.degree.lower()
-            priority = get_education_priority(edu.degree)
-            logger.info(f"Education: {edu.degree} -> Priority: {priority}")
+            priority = _get_education_priority(edu.degree)
+            logger.debug("Education: %s -> Priority: %d", edu.degree, priority)
             
-            # Determine if it's CGPA or percentage based on content
-            grade_value = self.escape_latex(edu.cgpa_or_percentage)
-            is_percentage = "%" in edu.cgpa_or_percentage or float(grade_value.replace('%', '').strip() or '0') > 10
+            # Determine if it's CGPA or percentage on the raw string, then
+            # escape once; stripping '%' after escaping would leave the
+            # backslash from '\%' behind.
+            raw_grade = edu.cgpa_or_percentage
+            is_percentage = "%" in raw_grade or float(raw_grade.replace('%', '').strip() or '0') > 10
+            grade_value = esc(raw_grade)
             
             # Determine board for school-level education
             board = None
@@ -184,19 +263,20 @@ class LaTeXGenerator:
                 board = "UP Board"  # Default, can be extended
             
             edu_entry = {
-                "degree": self.escape_latex(edu.degree),
-                "years": self.escape_latex(edu.session_year),
-                "institution": self.escape_latex(edu.college_name),
+                "degree": esc(edu.degree),
+                "years": esc(edu.session_year),
+                "institution": esc(edu.college_name),
                 "board": board,
                 "cgpa": grade_value if not is_percentage else None,
-                "percentage": grade_value.replace('%', '').strip() if is_percentage else None,
+                "percentage": esc(raw_grade.replace('%', '').strip()) if is_percentage else None,
                 "_priority": priority,  # For sorting
             }
             education.append(edu_entry)
         
         # Sort education by priority (highest first)
         education.sort(key=lambda x: x["_priority"], reverse=True)
-        logger.info(f"Sorted education order: {[e['degree'] for e in education]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sorted education order: %s", [e['degree'] for e in education])
         
         # Remove the internal priority field
         for edu in education:
@@ -204,32 +284,32 @@ class LaTeXGenerator:
         
         # Prepare projects (use optimized bullets if available)
         projects = []
-        optimized_projects = {}
         if optimized_content and "projects" in optimized_content:
-            for op in optimized_content["projects"]:
-                optimized_projects[op["project_name"]] = op.get("optimized_bullets", [])
-        
+            optimized_projects = {
+                op["project_name"]: op.get("optimized_bullets") or ()
+                for op in optimized_content["projects"]
+            }
+        else:
+            optimized_projects = {}
+
         for project in profile.projects:
             # Use optimized bullets if available, otherwise original
-            bullets = optimized_projects.get(
-                project.project_name,
-                project.bullet_points
-            )
+            bullets = optimized_projects.get(project.project_name) or project.bullet_points
             
             projects.append({
-                "name": self.escape_latex(project.project_name),
+                "name": esc(project.project_name),
                 "type": "Application",  # Default type
-                "technologies": [self.escape_latex(t) for t in project.tech_stack],
-                "bullets": [self.escape_latex(b) for b in bullets],
+                "technologies": list(map(esc, project.tech_stack)),
+                "bullets": list(map(esc, bullets)),
             })
         
         # Prepare certifications
         certifications = []
         for cert in profile.certifications:
             certifications.append({
-                "title": self.escape_latex(cert.certificate_name),
-                "issuer": self.escape_latex(cert.issuing_company),
-                "details": [self.escape_latex(b) for b in cert.bullet_points],
+                "title": esc(cert.certificate_name),
+                "issuer": esc(cert.issuing_company),
+                "details": list(map(esc, cert.bullet_points)),
             })
         
         # Optional fields
@@ -270,7 +350,10 @@ class LaTeXGenerator:
             Generated LaTeX code
         """
         try:
-            template = self.env.get_template(template_name)
+            template = self._template_cache.get(template_name)
+            if template is None:
+                template = self.env.get_template(template_name)
+                self._template_cache[template_name] = template
             data = self._prepare_profile_data(profile, optimized_content)
             
             latex_code = template.render(**data)
@@ -294,14 +377,8 @@ class LaTeXGenerator:
         Returns:
             Cleaned LaTeX code
         """
-        # Remove multiple consecutive blank lines
-        latex_code = re.sub(r'\n{3,}', '\n\n', latex_code)
-        
-        # Remove trailing whitespace from lines
-        lines = [line.rstrip() for line in latex_code.split('\n')]
-        latex_code = '\n'.join(lines)
-        
-        return latex_code
+        # Strip trailing whitespace and collapse blank-line runs in one pass
+        return _CLEANUP_RE.sub(_cleanup_replacement, latex_code)
     
     def validate_latex(self, latex_code: str) -> Dict[str, Any]:
         """
@@ -333,7 +410,7 @@ class LaTeXGenerator:
         
         # Check for common unescaped characters
         # These patterns check for unescaped special characters not in commands
-        if re.search(r'(?<!\\)[&%$#](?!\w)', latex_code):
+        if _UNESCAPED_SPECIAL_RE.search(latex_code):
             issues.append("Possible unescaped special characters detected")
         
         return {
@@ -2,61 +2,89 @@
 Groq LLM service for keyword extraction and text enhancement.
 Uses LLaMA-3.1-70B with deterministic JSON outputs.
 """
+import copy
 import json
+import time
+import itertools
+import random
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
-from groq import Groq, AsyncGroq
+import orjson
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional
+import httpx
+from pydantic import BaseModel
+from groq import AsyncGroq, APIConnectionError, InternalServerError, RateLimitError
 import re
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Transient Groq failures worth retrying
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
 
-class GroqLLMService:
-    """Service for interacting with Groq LLM API."""
-    
-    def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
-        self.async_client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        self.model = settings.GROQ_MODEL
-        self.temperature = settings.GROQ_TEMPERATURE
-        self.max_tokens = settings.GROQ_MAX_TOKENS
-    
-    def _extract_json(self, text: str) -> Dict[str, Any]:
-        """Extract JSON from LLM response text."""
-        # Try to find JSON in the response
-        json_match = re.search(r'\{[\s\S]*\}', text)
-        if json_match:
-            try:
-                return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                pass
-        
-        # Try to find JSON array
-        array_match = re.search(r'\[[\s\S]*\]', text)
-        if array_match:
-            try:
-                return {"data": json.loads(array_match.group())}
-            except json.JSONDecodeError:
-                pass
-        
-        raise ValueError(f"Could not extract JSON from response: {text[:200]}")
-    
-    async def extract_keywords_from_jd(self, job_description: str) -> Dict[str, List[str]]:
-        """
-        Extract ALL relevant keywords and skills from a job description for ATS matching.
-        
-        Args:
-            job_description: The job description text
-            
-        Returns:
-            Dictionary containing extracted keywords, skills, technologies, etc.
-        """
-        prompt = f"""Extract ALL keywords from this job description that an ATS system would scan for.
+_RETRY_MAX_ATTEMPTS = 5
+_RETRY_INITIAL_DELAY = 1.0  # seconds
+_RETRY_MAX_DELAY = 30.0
+
+# Responses for repeated inputs (same JD across sessions/iterations) are
+# served from an in-process content-addressed cache for this long.
+_RESPONSE_CACHE_TTL = 86400  # seconds
+
+# Scheduling priorities: lower value is served first. Interactive requests
+# (a user clicking "enhance") jump ahead of queued batch rewrites.
+_PRIORITY_INTERACTIVE = 0
+_PRIORITY_STANDARD = 5
+_PRIORITY_BATCH = 10
+
+
+def _content_key(prefix: str, *parts: Any) -> str:
+    """Build a content-addressed cache key from normalized inputs."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            digest.update(part.strip().lower().encode())
+        else:
+            digest.update(orjson.dumps(part, option=orjson.OPT_SORT_KEYS))
+    return f"{prefix}:{digest.hexdigest()}"
+
+
+# Client-side token budgeting. Groq rejects prompts that blow the context
+# window only after a full round-trip, so oversized inputs are trimmed
+# locally first. Llama tokenizes English at roughly 4 characters/token;
+# the estimate is deliberately conservative.
+_APPROX_CHARS_PER_TOKEN = 4
+_MAX_JD_TOKENS = 6000
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text to an approximate token budget, cutting at a word boundary."""
+    max_chars = max_tokens * _APPROX_CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    truncated = text[:max_chars]
+    # Don't end mid-word; back up to the last whitespace
+    cut = truncated.rfind(' ')
+    if cut > 0:
+        truncated = truncated[:cut]
+    logger.warning(
+        "Input truncated from ~%d to ~%d tokens to fit context budget",
+        len(text) // _APPROX_CHARS_PER_TOKEN, max_tokens
+    )
+    return truncated
+
+
+# Static sections of the keyword-extraction prompt, hoisted so each call
+# only concatenates the job description instead of rebuilding the whole
+# multi-KB template.
+_JD_EXTRACT_PREAMBLE = """Extract ALL keywords from this job description that an ATS system would scan for.
 
 JOB DESCRIPTION:
-{job_description}
+"""
+
+_JD_EXTRACT_SUFFIX = """
 
 EXTRACTION REQUIREMENTS:
 1. Extract EVERY technical term, technology, framework, library, tool mentioned
@@ -68,7 +96,7 @@ EXTRACTION REQUIREMENTS:
 7. Extract team/project methodologies (Agile, Scrum, etc.)
 
 Respond with ONLY a JSON object:
-{{
+{
     "keywords": ["keyword1", "keyword2", ...],
     "skills": ["skill1", "skill2", ...],
     "technologies": ["tech1", "tech2", ...],
@@ -76,7 +104,7 @@ Respond with ONLY a JSON object:
     "experience_requirements": ["requirement1", "requirement2", ...],
     "action_verbs": ["verb1", "verb2", ...],
     "methodologies": ["method1", "method2", ...]
-}}
+}
 
 CATEGORIES:
 - keywords: ALL important terms, role titles, domain-specific phrases
@@ -89,9 +117,322 @@ CATEGORIES:
 
 BE COMPREHENSIVE - extract 15-30 items per category. ATS matching depends on this."""
 
+
+class JDKeywords(BaseModel):
+    """
+    Schema for the keyword-extraction response.
+
+    Validates the LLM output in one pass and fills missing categories
+    with empty lists, replacing the manual required-keys loop. Unknown
+    extra keys are ignored by pydantic's defaults.
+    """
+    keywords: List[str] = []
+    skills: List[str] = []
+    technologies: List[str] = []
+    soft_skills: List[str] = []
+    experience_requirements: List[str] = []
+    action_verbs: List[str] = []
+    methodologies: List[str] = []
+
+
+def _build_rewrite_prompt(
+    bullets: List[str],
+    target_keywords: List[str],
+    context: str
+) -> str:
+    """Assemble the single-group bullet-rewrite prompt (pure, thread-safe)."""
+    return f"""Rewrite these bullet points to MAXIMIZE ATS keyword matching.
+
+ORIGINAL BULLET POINTS:
+{orjson.dumps(bullets, option=orjson.OPT_INDENT_2).decode()}
+
+TARGET KEYWORDS TO INJECT (include as many as possible):
+{', '.join(target_keywords)}
+
+CONTEXT: {context}
+
+CRITICAL INSTRUCTIONS:
+1. Each bullet MUST be 12-20 words (optimal ATS length)
+2. Start each bullet with a STRONG ACTION VERB: Developed, Implemented, Engineered, Designed, Built, Created, Optimized, Architected, Integrated, Deployed
+3. MUST include at least 2-3 keywords from the target list in each bullet
+4. Use EXACT keyword phrases where possible (e.g., "REST API" not just "API")
+5. Add technical context using keywords: "utilizing [keyword]", "leveraging [keyword]", "implementing [keyword]"
+6. Include metrics/numbers where possible: "reduced by X%", "improved X by Y%", "handled X+ requests"
+7. Make implicit skills explicit (if they built a web app, they used HTTP, handled requests, etc.)
+8. DO NOT completely fabricate features, but DO emphasize technical aspects using JD terminology
+
+EXAMPLE TRANSFORMATIONS:
+Original: "Built a website using React"
+Rewritten: "Developed responsive web application using React.js, implementing RESTful API integration and component-based architecture"
+
+Original: "Worked on database"
+Rewritten: "Engineered database schema utilizing MongoDB and implemented efficient query optimization for improved performance"
+
+Respond with ONLY a JSON object:
+{{
+    "rewritten_bullets": ["bullet1", "bullet2", ...],
+    "keywords_injected": ["keyword1", "keyword2", ...]
+}}"""
+
+
+def _build_batch_rewrite_prompt(payload: List[Dict[str, Any]]) -> str:
+    """Assemble the batched bullet-rewrite prompt (pure, thread-safe)."""
+    return f"""Rewrite every bullet group below to MAXIMIZE ATS keyword matching.
+
+BULLET GROUPS:
+{orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()}
+
+CRITICAL INSTRUCTIONS (apply to EVERY group):
+1. Each bullet MUST be 12-20 words (optimal ATS length)
+2. Start each bullet with a STRONG ACTION VERB: Developed, Implemented, Engineered, Designed, Built, Created, Optimized, Architected, Integrated, Deployed
+3. MUST include at least 2-3 keywords from the group's target_keywords in each bullet
+4. Use EXACT keyword phrases where possible (e.g., "REST API" not just "API")
+5. Include metrics/numbers where possible: "reduced by X%", "improved X by Y%", "handled X+ requests"
+6. DO NOT completely fabricate features, but DO emphasize technical aspects using JD terminology
+7. Keep each group's bullet count identical to the input
+
+Respond with ONLY a JSON object:
+{{
+    "results": [
+        {{
+            "id": "group id from input",
+            "rewritten_bullets": ["bullet1", "bullet2", ...],
+            "keywords_injected": ["keyword1", "keyword2", ...]
+        }},
+        ...
+    ]
+}}"""
+
+
+def _build_summary_prompt(
+    profile_data: Dict[str, Any],
+    job_description: str,
+    jd_keywords: Dict[str, List[str]]
+) -> str:
+    """Assemble the professional-summary prompt (pure, thread-safe)."""
+    # Extract key info from profile; chain/comprehensions build each
+    # list in one allocation instead of concatenating intermediates
+    skills = profile_data.get("skills", {})
+    all_skills = list(itertools.chain(
+        skills.get("programming_languages", []),
+        skills.get("technical_skills", []),
+        skills.get("developer_tools", [])
+    ))
+
+    projects = profile_data.get("projects", [])
+    project_names = [p.get("project_name", "") for p in projects[:3]]
+    project_techs = [t for p in projects[:3] for t in p.get("tech_stack", [])]
+
+    internships = profile_data.get("internships", [])
+    companies = [i.get("company_name", "") for i in internships[:2]]
+
+    all_jd_keywords = list(itertools.chain(
+        jd_keywords.get("skills", []),
+        jd_keywords.get("technologies", []),
+        jd_keywords.get("keywords", [])
+    ))
+    
+    return f"""Generate an ATS-OPTIMIZED professional summary that MAXIMIZES keyword matches.
+
+CANDIDATE PROFILE:
+- Programming Skills: {', '.join(all_skills[:20])}
+- Project Technologies: {', '.join(project_techs[:10])}
+- Notable Projects: {', '.join(project_names)}
+- Work Experience: {', '.join(companies) if companies else 'Fresh graduate/student'}
+
+JOB DESCRIPTION KEYWORDS TO INCLUDE (use as many as honestly possible):
+{', '.join(all_jd_keywords[:20])}
+
+Job Description Excerpt:
+{job_description[:600]}
+
+CRITICAL INSTRUCTIONS:
+1. Write 3-4 impactful sentences (60-100 words total)
+2. MUST include at least 8-10 keywords from the JD keyword list above
+3. Use EXACT keyword phrases from the JD (e.g., if JD says "React.js", use "React.js" not just "React")
+4. Start with a strong descriptor: "Results-driven", "Detail-oriented", "Passionate", etc.
+5. Mention specific technologies that match the JD
+6. Include soft skills mentioned in JD if applicable (team player, problem solver, etc.)
+7. Quantify if possible (e.g., "developed 5+ projects", "proficient in 10+ technologies")
+8. End with career goal aligned to the role
+
+EXAMPLE FORMAT:
+"Results-driven Software Developer with hands-on experience in [JD tech 1], [JD tech 2], and [JD tech 3]. 
+Developed [X] projects utilizing [JD technologies]. Strong foundation in [JD skills] with demonstrated 
+ability in [soft skill]. Seeking to leverage expertise in [role-related skill] to contribute to [company goal]."
+
+Respond with ONLY a JSON object:
+{{
+    "summary": "Your professional summary here...",
+    "keywords_included": ["keyword1", "keyword2", ...]
+}}"""
+
+
+class GroqLLMService:
+    """Service for interacting with Groq LLM API."""
+    
+    def __init__(self):
+        # Tuned connection pool: keepalive avoids a fresh TCP+TLS handshake
+        # per request, and HTTP/2 multiplexes concurrent pipeline calls
+        # over one connection.
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60.0
+            ),
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        self.async_client = AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=http_client)
+        self.model = settings.GROQ_MODEL
+        # Small model for pure pattern-extraction tasks: same quality at
+        # T=0, much faster with higher TPM ceilings.
+        self.fast_model = settings.GROQ_FAST_MODEL
+        self.temperature = settings.GROQ_TEMPERATURE
+        self.max_tokens = settings.GROQ_MAX_TOKENS
+        # Bound in-flight Groq requests so concurrent pipelines stay under
+        # the API's TPM/RPM limits without serializing everything.
+        self._sem = asyncio.Semaphore(settings.GROQ_MAX_CONCURRENCY)
+        # Priority-aware dispatch: requests are queued and drained by
+        # worker tasks so interactive calls preempt waiting batch work.
+        # Created lazily because __init__ may run without an event loop.
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._seq = 0
+        # Content-addressed response cache: key -> (expiry, result)
+        self._response_cache: Dict[str, Any] = {}
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Return a cached response if present and fresh."""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if expiry < time.monotonic():
+            del self._response_cache[key]
+            return None
+        # Callers mutate results downstream; hand out a private copy
+        return copy.deepcopy(value)
+
+    def _cache_put(self, key: str, value: Any) -> None:
+        """Store a response with the standard TTL."""
+        self._response_cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, copy.deepcopy(value))
+
+    def _ensure_workers(self) -> None:
+        """Create the request queue and worker tasks on first use."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(settings.GROQ_MAX_CONCURRENCY)
+        ]
+
+    async def _worker(self) -> None:
+        """Drain queued requests in priority order under the concurrency cap."""
+        while True:
+            _, _, kwargs, future = await self._queue.get()
+            try:
+                async with self._sem:
+                    result = await self.async_client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def _submit(self, priority: int, kwargs: Dict[str, Any]) -> Any:
+        """Enqueue one completion request and wait for its result."""
+        self._ensure_workers()
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        # seq breaks priority ties so equal-priority requests stay FIFO
+        await self._queue.put((priority, self._seq, kwargs, future))
+        return await future
+
+    async def _chat(self, priority: int = _PRIORITY_STANDARD, **kwargs) -> Any:
+        """
+        Issue one chat completion through the priority queue.
+
+        Lower priority values are dispatched first, so interactive calls
+        preempt queued batch work. Transient failures (429s, connection
+        drops, 5xx) are retried with exponential backoff and jitter,
+        honouring the Retry-After header when Groq provides one.
+        """
+        delay = _RETRY_INITIAL_DELAY
+        for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+            try:
+                return await self._submit(priority, kwargs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == _RETRY_MAX_ATTEMPTS:
+                    raise
+
+                wait = delay + random.uniform(0, delay / 2)
+                if isinstance(e, RateLimitError):
+                    retry_after = e.response.headers.get("retry-after")
+                    if retry_after:
+                        try:
+                            wait = float(retry_after)
+                        except ValueError:
+                            pass
+
+                logger.warning(
+                    "Groq request failed (%s), retry %d/%d in %.1fs",
+                    type(e).__name__, attempt, _RETRY_MAX_ATTEMPTS - 1, wait
+                )
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, _RETRY_MAX_DELAY)
+    
+    _json_decoder = json.JSONDecoder()
+
+    def _extract_json(self, text: str) -> Dict[str, Any]:
+        """
+        Extract JSON from LLM response text.
+
+        raw_decode stops at the end of the first valid value, so no regex
+        scan over the full response is needed.
+        """
+        for opener in ('{', '['):
+            start = text.find(opener)
+            if start == -1:
+                continue
+            try:
+                value, _ = self._json_decoder.raw_decode(text, start)
+            except json.JSONDecodeError:
+                continue
+            return value if isinstance(value, dict) else {"data": value}
+
+        raise ValueError(f"Could not extract JSON from response: {text[:200]}")
+    
+    async def extract_keywords_from_jd(self, job_description: str) -> Dict[str, List[str]]:
+        """
+        Extract ALL relevant keywords and skills from a job description for ATS matching.
+        
+        Args:
+            job_description: The job description text
+            
+        Returns:
+            Dictionary containing extracted keywords, skills, technologies, etc.
+        """
+        # Trim before keying the cache so a trimmed and untrimmed copy of
+        # the same oversized JD hit the same entry
+        job_description = _truncate_to_tokens(job_description, _MAX_JD_TOKENS)
+
+        cache_key = _content_key("jd", job_description)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Keyword extraction served from cache")
+            return cached
+
+        prompt = "".join((_JD_EXTRACT_PREAMBLE, job_description, _JD_EXTRACT_SUFFIX))
+
         try:
-            response = await self.async_client.chat.completions.create(
-                model=self.model,
+            response = await self._chat(
+                model=self.fast_model,
                 messages=[
                     {
                         "role": "system",
@@ -100,22 +441,25 @@ BE COMPREHENSIVE - extract 15-30 items per category. ATS matching depends on thi
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.0,  # Deterministic extraction
-                max_tokens=2000,  # Allow more tokens for comprehensive extraction
+                max_tokens=1200,  # Sized to observed extraction output, keeps TPM headroom
+                seed=0,  # Reproducible extraction at T=0
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
-            
-            # Validate structure and add missing keys
-            required_keys = ["keywords", "skills", "technologies", "soft_skills", "experience_requirements", "action_verbs", "methodologies"]
-            for key in required_keys:
-                if key not in result:
-                    result[key] = []
-            
-            # Log extraction stats
-            total = sum(len(result[k]) for k in required_keys)
-            logger.info(f"Extracted {total} total keywords from JD: technologies={len(result['technologies'])}, skills={len(result['skills'])}, keywords={len(result['keywords'])}")
+            # Schema validation coerces the payload and fills missing
+            # categories with empty lists in one pass
+            result = JDKeywords.model_validate(
+                orjson.loads(response.choices[0].message.content)
+            ).model_dump()
             
+            # Log extraction stats; skip the counting entirely when the
+            # level is disabled, and use lazy %-formatting so the message
+            # is only built if a handler accepts it
+            if logger.isEnabledFor(logging.INFO):
+                lens = {k: len(v) for k, v in result.items()}
+                logger.info("Extracted %d total keywords from JD: %s", sum(lens.values()), lens)
+
+            self._cache_put(cache_key, result)
             return result
             
         except Exception as e:
@@ -164,8 +508,8 @@ Respond with ONLY a JSON object in this exact format:
 - recommendations: Suggestions to improve match"""
 
         try:
-            response = await self.async_client.chat.completions.create(
-                model=self.model,
+            response = await self._chat(
+                model=self.fast_model,
                 messages=[
                     {
                         "role": "system",
@@ -174,11 +518,11 @@ Respond with ONLY a JSON object in this exact format:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                max_tokens=800,
                 response_format={"type": "json_object"}
             )
             
-            return json.loads(response.choices[0].message.content)
+            return orjson.loads(response.choices[0].message.content)
             
         except Exception as e:
             logger.error(f"Error aligning skills: {e}")
@@ -201,41 +545,71 @@ Respond with ONLY a JSON object in this exact format:
         Returns:
             Dictionary with rewritten bullets and injected keywords
         """
-        prompt = f"""Rewrite these bullet points to MAXIMIZE ATS keyword matching.
+        # Serializing large bullet lists is CPU work; keep it off the
+        # event loop so other in-flight calls are not stalled
+        prompt = await asyncio.to_thread(_build_rewrite_prompt, bullets, target_keywords, context)
 
-ORIGINAL BULLET POINTS:
-{json.dumps(bullets, indent=2)}
+        try:
+            response = await self._chat(
+                priority=_PRIORITY_BATCH,
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert ATS resume optimizer. Your bullets achieve 90%+ ATS scores by strategically incorporating job description keywords while maintaining truthfulness. Be aggressive with keyword placement."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                max_tokens=self.max_tokens,
+                response_format={"type": "json_object"}
+            )
+            
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info(f"Rewritten {len(bullets)} bullets, injected keywords: {result.get('keywords_injected', [])}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error rewriting bullets: {e}")
+            raise
 
-TARGET KEYWORDS TO INJECT (include as many as possible):
-{', '.join(target_keywords)}
+    async def rewrite_bullets_batch(
+        self,
+        groups: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Rewrite several bullet groups in a single LLM call.
 
-CONTEXT: {context}
+        Packing N groups into one prompt amortizes the network round-trip
+        and time-to-first-token over every project/internship instead of
+        paying it per group.
 
-CRITICAL INSTRUCTIONS:
-1. Each bullet MUST be 12-20 words (optimal ATS length)
-2. Start each bullet with a STRONG ACTION VERB: Developed, Implemented, Engineered, Designed, Built, Created, Optimized, Architected, Integrated, Deployed
-3. MUST include at least 2-3 keywords from the target list in each bullet
-4. Use EXACT keyword phrases where possible (e.g., "REST API" not just "API")
-5. Add technical context using keywords: "utilizing [keyword]", "leveraging [keyword]", "implementing [keyword]"
-6. Include metrics/numbers where possible: "reduced by X%", "improved X by Y%", "handled X+ requests"
-7. Make implicit skills explicit (if they built a web app, they used HTTP, handled requests, etc.)
-8. DO NOT completely fabricate features, but DO emphasize technical aspects using JD terminology
+        Args:
+            groups: List of dicts with keys "id", "bullets",
+                "target_keywords", and optional "context"
 
-EXAMPLE TRANSFORMATIONS:
-Original: "Built a website using React"
-Rewritten: "Developed responsive web application using React.js, implementing RESTful API integration and component-based architecture"
+        Returns:
+            Mapping of group id to {"rewritten_bullets": [...],
+            "keywords_injected": [...]}
+        """
+        if not groups:
+            return {}
 
-Original: "Worked on database"
-Rewritten: "Engineered database schema utilizing MongoDB and implemented efficient query optimization for improved performance"
+        payload = [
+            {
+                "id": group["id"],
+                "context": group.get("context", ""),
+                "bullets": group["bullets"],
+                "target_keywords": group.get("target_keywords", [])
+            }
+            for group in groups
+        ]
 
-Respond with ONLY a JSON object:
-{{
-    "rewritten_bullets": ["bullet1", "bullet2", ...],
-    "keywords_injected": ["keyword1", "keyword2", ...]
-}}"""
+        prompt = await asyncio.to_thread(_build_batch_rewrite_prompt, payload)
 
         try:
-            response = await self.async_client.chat.completions.create(
+            response = await self._chat(
+                priority=_PRIORITY_BATCH,
                 model=self.model,
                 messages=[
                     {
@@ -248,15 +622,16 @@ Respond with ONLY a JSON object:
                 max_tokens=self.max_tokens,
                 response_format={"type": "json_object"}
             )
-            
-            result = json.loads(response.choices[0].message.content)
-            logger.info(f"Rewritten {len(bullets)} bullets, injected keywords: {result.get('keywords_injected', [])}")
-            return result
-            
+
+            result = orjson.loads(response.choices[0].message.content)
+            by_id = {entry.get("id"): entry for entry in result.get("results", [])}
+            logger.info(f"Rewritten {len(groups)} bullet groups in one call")
+            return by_id
+
         except Exception as e:
-            logger.error(f"Error rewriting bullets: {e}")
+            logger.error(f"Error rewriting bullet groups: {e}")
             raise
-    
+
     async def enhance_text(
         self,
         text: str,
@@ -295,7 +670,8 @@ Respond with ONLY a JSON object:
 }}"""
 
         try:
-            response = await self.async_client.chat.completions.create(
+            response = await self._chat(
+                priority=_PRIORITY_INTERACTIVE,
                 model=self.model,
                 messages=[
                     {
@@ -305,17 +681,75 @@ Respond with ONLY a JSON object:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                max_tokens=500,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             return result.get("enhanced_text", text)
             
         except Exception as e:
             logger.error(f"Error enhancing text: {e}")
             return text
 
+    async def enhance_text_stream(
+        self,
+        text: str,
+        enhancement_type: str = "general"
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of enhance_text.
+
+        Yields chunks of the enhanced text as Groq produces them, so the
+        API layer can forward them via StreamingResponse instead of
+        waiting for the full completion. Streams plain text (Groq's JSON
+        mode does not support stream=True).
+
+        Args:
+            text: Original text
+            enhancement_type: Type of enhancement (general, technical, achievement)
+
+        Yields:
+            Chunks of the enhanced text
+        """
+        prompts = {
+            "general": "Improve this text for a professional resume. Make it concise and impactful.",
+            "technical": "Enhance this technical description for a resume. Highlight technical expertise.",
+            "achievement": "Rewrite this achievement to be more impactful. Include metrics if possible."
+        }
+
+        prompt = f"""{prompts.get(enhancement_type, prompts['general'])}
+
+Original Text:
+{text}
+
+Rules:
+1. Keep the same meaning
+2. Make it more professional
+3. Keep it concise
+4. Don't fabricate information
+
+Respond with ONLY the enhanced text, no preamble or commentary."""
+
+        async with self._sem:
+            stream = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a professional resume writer. Enhance text while maintaining accuracy."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
     async def generate_professional_summary(
         self,
         profile_data: Dict[str, Any],
@@ -334,63 +768,13 @@ Respond with ONLY a JSON object:
         Returns:
             Tailored professional summary (2-4 sentences)
         """
-        # Extract key info from profile
-        skills = profile_data.get("skills", {})
-        all_skills = (
-            skills.get("programming_languages", []) +
-            skills.get("technical_skills", []) +
-            skills.get("developer_tools", [])
+        prompt = await asyncio.to_thread(
+            _build_summary_prompt, profile_data, job_description, jd_keywords
         )
-        
-        projects = profile_data.get("projects", [])
-        project_names = [p.get("project_name", "") for p in projects[:3]]
-        project_techs = []
-        for p in projects[:3]:
-            project_techs.extend(p.get("tech_stack", []))
-        
-        internships = profile_data.get("internships", [])
-        companies = [i.get("company_name", "") for i in internships[:2]]
-        
-        target_skills = jd_keywords.get("skills", []) + jd_keywords.get("technologies", [])
-        all_jd_keywords = target_skills + jd_keywords.get("keywords", [])
-        
-        prompt = f"""Generate an ATS-OPTIMIZED professional summary that MAXIMIZES keyword matches.
-
-CANDIDATE PROFILE:
-- Programming Skills: {', '.join(all_skills[:20])}
-- Project Technologies: {', '.join(project_techs[:10])}
-- Notable Projects: {', '.join(project_names)}
-- Work Experience: {', '.join(companies) if companies else 'Fresh graduate/student'}
-
-JOB DESCRIPTION KEYWORDS TO INCLUDE (use as many as honestly possible):
-{', '.join(all_jd_keywords[:20])}
-
-Job Description Excerpt:
-{job_description[:600]}
-
-CRITICAL INSTRUCTIONS:
-1. Write 3-4 impactful sentences (60-100 words total)
-2. MUST include at least 8-10 keywords from the JD keyword list above
-3. Use EXACT keyword phrases from the JD (e.g., if JD says "React.js", use "React.js" not just "React")
-4. Start with a strong descriptor: "Results-driven", "Detail-oriented", "Passionate", etc.
-5. Mention specific technologies that match the JD
-6. Include soft skills mentioned in JD if applicable (team player, problem solver, etc.)
-7. Quantify if possible (e.g., "developed 5+ projects", "proficient in 10+ technologies")
-8. End with career goal aligned to the role
-
-EXAMPLE FORMAT:
-"Results-driven Software Developer with hands-on experience in [JD tech 1], [JD tech 2], and [JD tech 3]. 
-Developed [X] projects utilizing [JD technologies]. Strong foundation in [JD skills] with demonstrated 
-ability in [soft skill]. Seeking to leverage expertise in [role-related skill] to contribute to [company goal]."
-
-Respond with ONLY a JSON object:
-{{
-    "summary": "Your professional summary here...",
-    "keywords_included": ["keyword1", "keyword2", ...]
-}}"""
 
         try:
-            response = await self.async_client.chat.completions.create(
+            response = await self._chat(
+                priority=_PRIORITY_INTERACTIVE,
                 model=self.model,
                 messages=[
                     {
@@ -400,11 +784,11 @@ Respond with ONLY a JSON object:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=600,
+                max_tokens=350,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             summary = result.get("summary", "")
             keywords = result.get("keywords_included", [])
             logger.info(f"Generated summary with {len(keywords)} JD keywords: {keywords}")
@@ -430,8 +814,14 @@ Respond with ONLY a JSON object:
         Returns:
             Optimized skills with JD-relevant skills prioritized and related skills added
         """
+        cache_key = _content_key("skills", profile_skills, jd_keywords)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Skills optimization served from cache")
+            return cached
+
         target_skills = jd_keywords.get("skills", []) + jd_keywords.get("technologies", [])
-        
+
         prompt = f"""You are an ATS optimization expert. Optimize these skills sections to maximize ATS score for this job.
 
 CANDIDATE'S CURRENT SKILLS:
@@ -473,7 +863,7 @@ Respond with ONLY a JSON object:
 }}"""
 
         try:
-            response = await self.async_client.chat.completions.create(
+            response = await self._chat(
                 model=self.model,
                 messages=[
                     {
@@ -483,24 +873,158 @@ Respond with ONLY a JSON object:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.2,  # Slightly creative for skill inference
-                max_tokens=self.max_tokens,
+                max_tokens=800,
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             logger.info(f"Skills optimized. Added: {result.get('skills_added', [])}")
-            return {
-                "programming_languages": result.get("programming_languages", profile_skills.get("programming_languages", [])),
-                "technical_skills": result.get("technical_skills", profile_skills.get("technical_skills", [])),
-                "developer_tools": result.get("developer_tools", profile_skills.get("developer_tools", [])),
-                "keywords_prioritized": result.get("keywords_prioritized", []),
-                "skills_added": result.get("skills_added", [])
+            optimized = {
+                key: result.get(key) or profile_skills.get(key, [])
+                for key in ("programming_languages", "technical_skills", "developer_tools")
             }
+            optimized["keywords_prioritized"] = result.get("keywords_prioritized", [])
+            optimized["skills_added"] = result.get("skills_added", [])
+            self._cache_put(cache_key, optimized)
+            return optimized
             
         except Exception as e:
             logger.error(f"Error optimizing skills: {e}")
             return profile_skills
 
+    async def analyze_profile_for_jd(
+        self,
+        profile_skills: Dict[str, List[str]],
+        profile_data: Dict[str, Any],
+        jd_keywords: Dict[str, List[str]],
+        job_description: str
+    ) -> Dict[str, Any]:
+        """
+        Fused skill alignment + skill optimization + professional summary.
+
+        The three analyses share the same inputs (profile skills plus JD
+        keywords), so sending them as one prompt pays the shared context
+        tokens and the network round-trip once instead of three times.
+
+        Args:
+            profile_skills: User's skills from profile
+            profile_data: User's profile information (projects, internships)
+            jd_keywords: Keywords extracted from job description
+            job_description: Target job description
+
+        Returns:
+            Dictionary with "alignment", "optimized_skills" and "summary" keys
+        """
+        cache_key = _content_key("analysis", profile_skills, jd_keywords, job_description)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Profile analysis served from cache")
+            return cached
+
+        target_skills = jd_keywords.get("skills", []) + jd_keywords.get("technologies", [])
+        all_jd_keywords = target_skills + jd_keywords.get("keywords", [])
+
+        projects = profile_data.get("projects", [])
+        project_names = [p.get("project_name", "") for p in projects[:3]]
+        internships = profile_data.get("internships", [])
+        companies = [i.get("company_name", "") for i in internships[:2]]
+
+        prompt = f"""Analyze this candidate against the job and produce THREE results in one response.
+
+CANDIDATE'S CURRENT SKILLS:
+- Programming Languages: {', '.join(profile_skills.get('programming_languages', []))}
+- Technical Skills: {', '.join(profile_skills.get('technical_skills', []))}
+- Developer Tools: {', '.join(profile_skills.get('developer_tools', []))}
+
+CANDIDATE BACKGROUND:
+- Notable Projects: {', '.join(project_names)}
+- Work Experience: {', '.join(companies) if companies else 'Fresh graduate/student'}
+
+JOB REQUIRED SKILLS/TECHNOLOGIES:
+{', '.join(target_skills)}
+
+JOB DESCRIPTION KEYWORDS (use as many as honestly possible):
+{', '.join(all_jd_keywords[:20])}
+
+Job Description Excerpt:
+{job_description[:600]}
+
+TASK 1 - ALIGNMENT: Compare candidate skills with job requirements.
+
+TASK 2 - OPTIMIZED SKILLS: Reorder each skill category with JD-matching
+skills first, add accepted variations/synonyms, and add related skills
+the candidate LIKELY knows based on their existing skills (e.g. React ->
+JSX, Hooks; Python -> pip, virtual environments; Git -> version control).
+Each category should have 8-15 skills using EXACT JD terminology where
+the candidate has matching skills.
+
+TASK 3 - SUMMARY: Write a 3-4 sentence (60-100 word) ATS-optimized
+professional summary that includes at least 8-10 keywords from the JD
+keyword list, starts with a strong descriptor, and ends with a career
+goal aligned to the role. Don't fabricate experience.
+
+Respond with ONLY a JSON object:
+{{
+    "alignment": {{
+        "matched_skills": ["skill1", ...],
+        "missing_skills": ["skill1", ...],
+        "transferable_skills": ["skill1", ...],
+        "skill_match_percentage": 75
+    }},
+    "optimized_skills": {{
+        "programming_languages": ["skill1", ...],
+        "technical_skills": ["skill1", ...],
+        "developer_tools": ["tool1", ...],
+        "keywords_prioritized": ["keyword1", ...],
+        "skills_added": ["skill1", ...]
+    }},
+    "summary": "Your professional summary here..."
+}}"""
+
+        try:
+            response = await self._chat(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an ATS optimization expert and resume writer. Maximize keyword matches while staying truthful about the candidate's abilities. Always respond with valid JSON only."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                max_tokens=1200,
+                response_format={"type": "json_object"}
+            )
+
+            result = orjson.loads(response.choices[0].message.content)
+            skills = result.get("optimized_skills") or {}
+            analysis = {
+                "alignment": result.get("alignment") or {},
+                "optimized_skills": {
+                    "programming_languages": skills.get("programming_languages", profile_skills.get("programming_languages", [])),
+                    "technical_skills": skills.get("technical_skills", profile_skills.get("technical_skills", [])),
+                    "developer_tools": skills.get("developer_tools", profile_skills.get("developer_tools", [])),
+                    "keywords_prioritized": skills.get("keywords_prioritized", []),
+                    "skills_added": skills.get("skills_added", [])
+                },
+                "summary": result.get("summary", "")
+            }
+            logger.info(f"Profile analysis complete. Added skills: {analysis['optimized_skills']['skills_added']}")
+            self._cache_put(cache_key, analysis)
+            return analysis
+
+        except Exception as e:
+            logger.error(f"Error analyzing profile: {e}")
+            raise
+
+
+@lru_cache(maxsize=1)
+def get_groq_service() -> GroqLLMService:
+    """
+    Lazy singleton accessor.
 
-# Singleton instance
-groq_service = GroqLLMService()
+    Building the service opens HTTP connection pools, so construction is
+    deferred until the first caller actually needs the LLM instead of
+    happening at import time in every worker.
+    """
+    return GroqLLMService()
@@ -5,9 +5,15 @@ import logging
 import sys
 from typing import Any, Dict
 
+import orjson
 import structlog
 
 
+def _orjson_dumps(obj: Any, **_: Any) -> str:
+    """Serialize log records with orjson (much faster than stdlib json)."""
+    return orjson.dumps(obj, default=str).decode()
+
+
 def configure_logging(debug: bool = False) -> None:
     """
     Configure structured logging for the application.
@@ -25,9 +31,13 @@ def configure_logging(debug: bool = False) -> None:
         level=log_level,
     )
     
-    # Configure structlog
-    structlog.configure(
-        processors=[
+    # Configure structlog. Each processor is a Python call per record, so
+    # the production chain is kept lean: epoch timestamps instead of
+    # per-record strftime, orjson for rendering, and the debug-oriented
+    # processors (stack info, byte decoding, pretty console output) only
+    # when debug logging is on.
+    if debug:
+        processors = [
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
@@ -36,8 +46,21 @@ def configure_logging(debug: bool = False) -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if not debug else structlog.dev.ConsoleRenderer()
-        ],
+            structlog.dev.ConsoleRenderer()
+        ]
+    else:
+        processors = [
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt=None, utc=True),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        ]
+    
+    structlog.configure(
+        processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
@@ -58,32 +81,33 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
+# Request logging runs once per HTTP request, so the logger is bound
+# once at module load: the component key and the cached processor chain
+# (cache_logger_on_first_use=True) are reused instead of rebuilt per call.
+_request_logger = structlog.get_logger("http", component="http")
+
+
 def log_request(
-    logger: structlog.BoundLogger,
     method: str,
     path: str,
     status_code: int,
     duration_ms: float,
-    **extra: Any
 ) -> None:
     """
-    Log an HTTP request.
+    Log an HTTP request via the prebound request logger.
     
     Args:
-        logger: Logger instance
         method: HTTP method
         path: Request path
         status_code: Response status code
         duration_ms: Request duration in milliseconds
-        **extra: Additional fields to log
     """
-    logger.info(
+    _request_logger.info(
         "http_request",
         method=method,
         path=path,
         status_code=status_code,
         duration_ms=round(duration_ms, 2),
-        **extra
     )
 
 
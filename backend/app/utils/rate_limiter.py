@@ -2,13 +2,31 @@
 Rate limiting middleware and utilities.
 """
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+from collections import defaultdict, deque
+from typing import Deque, Dict, Tuple
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.config import settings
 
+# Redis is optional (mirrors the Celery handling in services.tasks).
+# When available, rate limiting is shared across workers; otherwise each
+# process falls back to its own in-memory window.
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+# How often (in calls) to sweep empty per-key deques so one-off clients
+# don't accumulate forever
+_SWEEP_INTERVAL = 1024
+
+# Paths exempt from rate limiting, hoisted so the hot path does one
+# frozenset lookup instead of building a list per request
+_SKIP_PATHS = frozenset({"/health", "/", "/docs", "/redoc", "/openapi.json"})
+
 
 class RateLimiter:
     """Simple in-memory rate limiter."""
@@ -16,7 +34,11 @@ class RateLimiter:
     def __init__(self, requests_limit: int, window_seconds: int):
         self.requests_limit = requests_limit
         self.window_seconds = window_seconds
-        self.requests: Dict[str, list] = defaultdict(list)
+        # Timestamps are appended in order, so each deque is monotonic and
+        # expiry is popleft until the head is inside the window - O(1)
+        # amortized versus rebuilding a list per request
+        self.requests: Dict[str, Deque[float]] = defaultdict(deque)
+        self._calls = 0
     
     def is_allowed(self, key: str) -> Tuple[bool, int]:
         """
@@ -28,24 +50,77 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, remaining_requests)
         """
-        now = time.time()
+        # monotonic() is immune to wall-clock jumps corrupting windows
+        now = time.monotonic()
         window_start = now - self.window_seconds
         
-        # Clean old requests
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if req_time > window_start
-        ]
+        # Evict expired entries from the head only
+        window = self.requests[key]
+        while window and window[0] <= window_start:
+            window.popleft()
+        
+        # Periodically drop empty deques so stale keys don't accumulate
+        self._calls += 1
+        if self._calls % _SWEEP_INTERVAL == 0:
+            self._sweep()
         
         # Check limit
-        if len(self.requests[key]) >= self.requests_limit:
+        if len(window) >= self.requests_limit:
             return False, 0
         
         # Add current request
-        self.requests[key].append(now)
-        remaining = self.requests_limit - len(self.requests[key])
+        window.append(now)
+        remaining = self.requests_limit - len(window)
         
         return True, remaining
+    
+    def _sweep(self) -> None:
+        """Delete keys whose windows have fully expired."""
+        empty = [key for key, window in self.requests.items() if not window]
+        for key in empty:
+            del self.requests[key]
+
+
+class RedisRateLimiter:
+    """
+    Fixed-window rate limiter backed by Redis.
+    
+    All workers share the same counters, so the limit is global rather
+    than per-process, and there is no Python-side state to race or grow.
+    """
+    
+    # Atomic increment-and-expire: the key's TTL is set only on the first
+    # hit of each window
+    _SCRIPT = (
+        "local c = redis.call('INCR', KEYS[1]) "
+        "if c == 1 then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end "
+        "return c"
+    )
+    
+    def __init__(self, requests_limit: int, window_seconds: int):
+        self.requests_limit = requests_limit
+        self.window_seconds = window_seconds
+        self._redis = aioredis.from_url(settings.REDIS_URL)
+        self._incr = self._redis.register_script(self._SCRIPT)
+    
+    async def is_allowed(self, key: str) -> Tuple[bool, int]:
+        """
+        Check if request is allowed for the given key.
+        
+        Args:
+            key: Identifier for rate limiting (e.g., IP address)
+            
+        Returns:
+            Tuple of (is_allowed, remaining_requests)
+        """
+        bucket = int(time.time() // self.window_seconds)
+        count = await self._incr(
+            keys=[f"rl:{key}:{bucket}"],
+            args=[self.window_seconds * 1000]
+        )
+        if count > self.requests_limit:
+            return False, 0
+        return True, self.requests_limit - count
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -53,21 +128,28 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     
     def __init__(self, app, requests_limit: int = None, window_seconds: int = None):
         super().__init__(app)
-        self.limiter = RateLimiter(
+        limiter_cls = RedisRateLimiter if REDIS_AVAILABLE else RateLimiter
+        self.limiter = limiter_cls(
             requests_limit=requests_limit or settings.RATE_LIMIT_REQUESTS,
             window_seconds=window_seconds or settings.RATE_LIMIT_WINDOW
         )
+        # The limit never changes after construction; encode it once so
+        # the raw header append below skips per-request str+encode work
+        self._limit_bytes = str(self.limiter.requests_limit).encode("ascii")
     
     async def dispatch(self, request: Request, call_next):
         # Get client IP
         client_ip = request.client.host if request.client else "unknown"
         
         # Skip rate limiting for health check
-        if request.url.path in ["/health", "/", "/docs", "/redoc", "/openapi.json"]:
+        if request.url.path in _SKIP_PATHS:
             return await call_next(request)
         
         # Check rate limit
-        is_allowed, remaining = self.limiter.is_allowed(client_ip)
+        if REDIS_AVAILABLE:
+            is_allowed, remaining = await self.limiter.is_allowed(client_ip)
+        else:
+            is_allowed, remaining = self.limiter.is_allowed(client_ip)
         
         if not is_allowed:
             raise HTTPException(
@@ -75,9 +157,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 detail="Rate limit exceeded. Please try again later."
             )
         
-        # Add rate limit headers
+        # Add rate limit headers; appending pre-encoded raw pairs skips
+        # MutableHeaders' per-assignment lookup and encode
         response = await call_next(request)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Limit"] = str(self.limiter.requests_limit)
+        response.headers.raw.extend([
+            (b"x-ratelimit-remaining", str(remaining).encode("ascii")),
+            (b"x-ratelimit-limit", self._limit_bytes),
+        ])
         
         return response
@@ -4,13 +4,31 @@ Utility functions for input sanitization and validation.
 import re
 import html
 from typing import Any, Dict, List, Optional
-import bleach
+
+# Patterns compiled once at import; sanitize_* run per string field of
+# every profile payload, so per-call re.compile churn adds up
+_TAG_RE = re.compile(r'<[^>]+>')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_RE = re.compile(r'^https?://[^\s<>"{}|\\^`\[\]]+$')
+_PHONE_RE = re.compile(r'[^\d\s\-\+\(\)]')
+# Deletion table covering ASCII: str.translate is a C-level loop, much
+# faster than the regex engine for the common all-ASCII phone string
+_PHONE_DEL_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128))
+    if not (c.isdigit() or c in ' \t-+()')
+))
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
 
 
 def sanitize_string(text: str) -> str:
     """
     Sanitize a string by removing potentially dangerous content.
     
+    Strips HTML tags, then escapes what remains. The old pipeline ran
+    html.escape first, which meant the follow-up script regex and bleach
+    pass could never match a real tag - the html5lib parse per field was
+    pure overhead.
+    
     Args:
         text: Input string
         
@@ -20,16 +38,28 @@ def sanitize_string(text: str) -> str:
     if not text:
         return ""
     
-    # HTML escape
-    text = html.escape(text)
+    return html.escape(_TAG_RE.sub('', text)).strip()
+
+
+def sanitize_html_strict(text: str) -> str:
+    """
+    Sanitize text with a real HTML sanitizer.
     
-    # Remove any script tags that might have slipped through
-    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    Lazy-imports bleach on first use so the common tag-strip path never
+    pays its html5lib import cost; intended only for inputs that must
+    keep some markup semantics rather than be flattened to text.
     
-    # Remove other potentially dangerous HTML
-    text = bleach.clean(text, tags=[], strip=True)
+    Args:
+        text: Input string
+        
+    Returns:
+        Sanitized string
+    """
+    if not text:
+        return ""
     
-    return text.strip()
+    import bleach
+    return bleach.clean(text, tags=[], strip=True).strip()
 
 
 def sanitize_email(email: str) -> str:
@@ -47,9 +77,12 @@ def sanitize_email(email: str) -> str:
     
     email = email.lower().strip()
     
+    # Valid addresses here are ASCII-only; reject early without the regex
+    if not email.isascii():
+        return ""
+    
     # Basic email pattern validation
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if re.match(pattern, email):
+    if _EMAIL_RE.match(email):
         return email
     
     return ""
@@ -78,8 +111,7 @@ def sanitize_url(url: str) -> str:
             return ""
     
     # Basic URL pattern validation
-    pattern = r'^https?://[^\s<>"{}|\\^`\[\]]+$'
-    if re.match(pattern, url):
+    if _URL_RE.match(url):
         return url
     
     return ""
@@ -99,8 +131,9 @@ def sanitize_phone(phone: str) -> str:
         return ""
     
     # Keep only digits, spaces, hyphens, parentheses, and plus sign
-    sanitized = re.sub(r'[^\d\s\-\+\(\)]', '', phone)
-    return sanitized.strip()
+    if phone.isascii():
+        return phone.translate(_PHONE_DEL_TABLE).strip()
+    return _PHONE_RE.sub('', phone).strip()
 
 
 def sanitize_dict(data: Dict[str, Any], keys_to_sanitize: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -136,6 +169,44 @@ def sanitize_dict(data: Dict[str, Any], keys_to_sanitize: Optional[List[str]] =
     return sanitized
 
 
+def sanitize_dict_inplace(data: Dict[str, Any], keys_to_sanitize: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Sanitize string values in a dictionary, mutating it in place.
+    
+    Iterative stack-based variant of sanitize_dict for callers that own
+    the dictionary: no fresh dicts or lists are allocated per level, so
+    deep profile documents avoid the O(N) copy and GC pressure of the
+    rebuilding version.
+    
+    Args:
+        data: Input dictionary (mutated in place)
+        keys_to_sanitize: Optional list of keys to sanitize (sanitizes all if None)
+        
+    Returns:
+        The same dictionary, for call-site convenience
+    """
+    keys = None if keys_to_sanitize is None else frozenset(keys_to_sanitize)
+    stack: List[Any] = [data]
+    
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for key, value in current.items():
+                if isinstance(value, str):
+                    if keys is None or key in keys:
+                        current[key] = sanitize_string(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:  # list
+            for index, value in enumerate(current):
+                if isinstance(value, str):
+                    current[index] = sanitize_string(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+    
+    return data
+
+
 def validate_password_strength(password: str) -> Dict[str, Any]:
     """
     Validate password strength and return detailed feedback.
@@ -158,26 +229,39 @@ def validate_password_strength(password: str) -> Dict[str, Any]:
     if len(password) >= 12:
         score += 10
     
+    # Single pass over the password with character-class flags instead of
+    # four separate regex scans
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if char.isupper():
+            has_upper = True
+        elif char.islower():
+            has_lower = True
+        elif char.isdigit():
+            has_digit = True
+        elif char in _PASSWORD_SPECIALS:
+            has_special = True
+    
     # Uppercase check
-    if re.search(r'[A-Z]', password):
+    if has_upper:
         score += 20
     else:
         issues.append("Password must contain at least one uppercase letter")
     
     # Lowercase check
-    if re.search(r'[a-z]', password):
+    if has_lower:
         score += 20
     else:
         issues.append("Password must contain at least one lowercase letter")
     
     # Digit check
-    if re.search(r'\d', password):
+    if has_digit:
         score += 15
     else:
         issues.append("Password must contain at least one digit")
     
     # Special character check
-    if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if has_special:
         score += 15
     else:
         issues.append("Password must contain at least one special character")
@@ -1,6 +1,7 @@
 """
 Pytest configuration and fixtures.
 """
+import copy
 import pytest
 import asyncio
 from typing import Generator
@@ -14,9 +15,9 @@ def event_loop() -> Generator:
     loop.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_profile_data():
-    """Sample profile data for testing."""
+    """Sample profile data for testing. Session-scoped: treat as read-only."""
     return {
         "personal_details": {
             "full_name": "John Doe",
@@ -81,6 +82,12 @@ def sample_profile_data():
 
 
 @pytest.fixture
+def sample_profile_data_mutable(sample_profile_data):
+    """Deep copy of the sample profile for tests that mutate it."""
+    return copy.deepcopy(sample_profile_data)
+
+
+@pytest.fixture(scope="session")
 def sample_job_description():
     """Sample job description for testing."""
     return """
@@ -5,14 +5,15 @@ import pytest
 from app.services.ats_engine import ATSOptimizationEngine
 
 
+@pytest.fixture(scope="module")
+def ats_engine():
+    """Create ATS engine instance (stateless; shared across the module)."""
+    return ATSOptimizationEngine()
+
+
 class TestATSEngine:
     """Tests for ATS optimization engine."""
     
-    @pytest.fixture
-    def ats_engine(self):
-        """Create ATS engine instance."""
-        return ATSOptimizationEngine()
-    
     def test_bullet_length_analysis_optimal(self, ats_engine):
         """Test bullet analysis with optimal length bullets."""
         bullets = [
@@ -54,6 +55,20 @@ class TestATSEngine:
         assert "kubernetes" in missing
         assert "sql" in missing
     
+    def test_keyword_match_synonyms(self, ats_engine):
+        """Test that synonym variants match without an exact string hit."""
+        profile_keywords = ["k8s", "postgres"]
+        jd_keywords = ["kubernetes", "postgresql"]
+        
+        match_pct, matched, missing = ats_engine._calculate_keyword_match(
+            profile_keywords, jd_keywords
+        )
+        
+        assert match_pct == 100.0
+        assert "kubernetes" in matched
+        assert "postgresql" in matched
+        assert missing == []
+    
     def test_keyword_stuffing_detection_clean(self, ats_engine):
         """Test keyword stuffing detection with clean text."""
         text = """
@@ -7,6 +7,12 @@ from app.main import app
 from app.core.security import hash_password, verify_password, create_access_token, decode_token
 
 
+@pytest.fixture(scope="module")
+def known_hash():
+    """One bcrypt hash shared by the verification tests (~100ms per call)."""
+    return hash_password("TestPassword123!")
+
+
 class TestPasswordHashing:
     """Tests for password hashing functions."""
     
@@ -18,39 +24,32 @@ class TestPasswordHashing:
         assert hashed != password
         assert len(hashed) > 0
     
-    def test_verify_password_correct(self):
+    def test_verify_password_correct(self, known_hash):
         """Test password verification with correct password."""
-        password = "TestPassword123!"
-        hashed = hash_password(password)
-        
-        assert verify_password(password, hashed) is True
+        assert verify_password("TestPassword123!", known_hash) is True
     
-    def test_verify_password_incorrect(self):
+    def test_verify_password_incorrect(self, known_hash):
         """Test password verification with incorrect password."""
-        password = "TestPassword123!"
-        wrong_password = "WrongPassword456!"
-        hashed = hash_password(password)
-        
-        assert verify_password(wrong_password, hashed) is False
+        assert verify_password("WrongPassword456!", known_hash) is False
+
+
+@pytest.fixture(scope="module")
+def access_token():
+    """One signed token shared by the JWT tests."""
+    return create_access_token({"sub": "test_user_id"})
 
 
 class TestJWTTokens:
     """Tests for JWT token functions."""
     
-    def test_create_access_token(self):
+    def test_create_access_token(self, access_token):
         """Test access token creation."""
-        data = {"sub": "test_user_id"}
-        token = create_access_token(data)
-        
-        assert token is not None
-        assert len(token) > 0
+        assert access_token is not None
+        assert len(access_token) > 0
     
-    def test_decode_valid_token(self):
+    def test_decode_valid_token(self, access_token):
         """Test decoding valid token."""
-        data = {"sub": "test_user_id"}
-        token = create_access_token(data)
-        
-        payload = decode_token(token)
+        payload = decode_token(access_token)
         
         assert payload is not None
         assert payload["sub"] == "test_user_id"
@@ -5,14 +5,15 @@ import pytest
 from app.services.latex_generator import LaTeXGenerator
 
 
+@pytest.fixture(scope="module")
+def latex_gen():
+    """Create LaTeX generator instance (stateless; shared across the module)."""
+    return LaTeXGenerator()
+
+
 class TestLaTeXGenerator:
     """Tests for LaTeX generator."""
     
-    @pytest.fixture
-    def latex_gen(self):
-        """Create LaTeX generator instance."""
-        return LaTeXGenerator()
-    
     def test_escape_latex_special_chars(self, latex_gen):
         """Test LaTeX special character escaping."""
         text = "Test & Co. with 50% discount #1"
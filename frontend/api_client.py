@@ -2,60 +2,152 @@
 API Client for communicating with FastAPI backend.
 All API interactions are centralized here.
 """
-import requests
+import asyncio
+import io
+import time
+
+import httpx
+import orjson
 from typing import Dict, Any, Optional, List
 import streamlit as st
 from config import config
 
+# Idempotent GETs repeated within this window return the cached payload
+_GET_CACHE_TTL = 30.0
+
 
 class APIClient:
     """Client for backend API communication."""
     
     def __init__(self):
         self.base_url = config.API_BASE_URL
+        # One HTTP/2 client for the APIClient's lifetime: keep-alive
+        # pooling means the many calls a single page render fires reuse
+        # one socket instead of paying a TCP+TLS handshake each, requests
+        # multiplex over that socket instead of queueing, and HPACK
+        # compresses the repeated Authorization header. Connect failures
+        # are retried at the transport layer.
+        self.client = httpx.Client(
+            base_url=config.API_BASE_URL,
+            http2=True,
+            # Constant for every request; set once instead of per call
+            headers={"Content-Type": "application/json"},
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=httpx.HTTPTransport(retries=3, http2=True),
+        )
+        # Header dict memoized per token so sequential calls in one page
+        # render don't rebuild it. Single-entry {token: headers} map,
+        # replaced (never updated) in one assignment: sessions run in
+        # separate threads against this shared instance, and a two-field
+        # memo could interleave one session's token with another's header
+        self._headers_memo: Dict[Optional[str], Dict[str, str]] = {}
+        # (token, endpoint key) -> (fetch time, payload); tab navigation
+        # refetches the same profile/CV repeatedly within seconds
+        self._get_cache: Dict[tuple, tuple] = {}
+        # (token, endpoint key) -> (etag, payload); survives TTL expiry
+        # and mutations so the server can answer revalidations with 304
+        self._etag_cache: Dict[tuple, tuple] = {}
+    
+    @staticmethod
+    def _json(obj: Any) -> bytes:
+        """Serialize a request body with orjson (bytes, no intermediate str)."""
+        return orjson.dumps(obj)
+    
+    def _cached_get(self, key: tuple, fetch) -> Any:
+        """
+        Serve an idempotent GET from the short-lived cache when fresh.
+        
+        Keys include the token so a re-login never sees another user's
+        payloads; any mutating call clears the whole cache.
+        """
+        cache_key = (st.session_state.get(config.TOKEN_KEY),) + key
+        hit = self._get_cache.get(cache_key)
+        now = time.monotonic()
+        if hit is not None and now - hit[0] < _GET_CACHE_TTL:
+            return hit[1]
+        value = fetch()
+        self._get_cache[cache_key] = (now, value)
+        return value
+    
+    def _mutate(self, response: httpx.Response) -> Dict[str, Any]:
+        """Handle a mutating call's response and drop the GET cache."""
+        result = self._handle_response(response)
+        self._get_cache.clear()
+        return result
     
     def _get_headers(self) -> Dict[str, str]:
         """Get headers with authentication token."""
-        headers = {"Content-Type": "application/json"}
-        
         token = st.session_state.get(config.TOKEN_KEY)
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
+        headers = self._headers_memo.get(token)
+        if headers is None:
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            # Atomic whole-dict replacement; a concurrent session at
+            # worst rebuilds its own entry, never sees a mixed one
+            self._headers_memo = {token: headers}
         return headers
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Handle API response and errors."""
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Issue an authenticated request, retrying once after a 401.
+        
+        On token expiry the old flow returned a None sentinel that no
+        caller acted on; here the refresh and the retry happen in place.
+        Bodies are pre-serialized bytes, so the retry reuses them as-is.
+        """
+        extra_headers = kwargs.pop("headers", None)
+
+        def _headers() -> Dict[str, str]:
+            headers = self._get_headers()
+            return {**headers, **extra_headers} if extra_headers else headers
+
+        response = self.client.request(
+            method, path, headers=_headers(), **kwargs
+        )
         if response.status_code == 401:
-            # Token expired, try to refresh
             if self._refresh_token():
-                # Retry the request
-                return None  # Signal to retry
+                response = self.client.request(
+                    method, path, headers=_headers(), **kwargs
+                )
             else:
                 # Clear session and redirect to login
                 self._clear_session()
                 st.error("Session expired. Please log in again.")
                 st.rerun()
+        return response
+    
+    @staticmethod
+    def _extract_error(response: httpx.Response) -> str:
+        """
+        Pull a human-readable message out of an error body in one parse.
         
+        Handles the known FastAPI shapes — plain string detail, or a
+        validation-error list — returning as soon as one matches.
+        """
+        try:
+            detail = orjson.loads(response.content).get("detail", "An error occurred")
+        except (ValueError, AttributeError):
+            # Non-JSON or non-object error body
+            return response.text or "An error occurred"
+        if isinstance(detail, str):
+            return detail
+        if isinstance(detail, list):
+            if not detail:
+                return "Validation error"
+            first = detail[0]
+            if isinstance(first, dict):
+                return first.get("msg", "Validation error")
+            return str(first)
+        return str(detail)
+    
+    def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Handle API response and errors."""
         if response.status_code >= 400:
-            try:
-                error_data = response.json()
-                detail = error_data.get("detail", "An error occurred")
-                
-                # Handle validation errors (FastAPI returns list of errors)
-                if isinstance(detail, list):
-                    # Extract first validation error message
-                    if detail and isinstance(detail[0], dict):
-                        error_msg = detail[0].get("msg", "Validation error")
-                    else:
-                        error_msg = str(detail[0]) if detail else "Validation error"
-                else:
-                    error_msg = str(detail)
-            except:
-                error_msg = response.text or "An error occurred"
-            raise Exception(error_msg)
+            raise Exception(self._extract_error(response))
         
-        return response.json()
+        # orjson parses the raw bytes in C, several times faster than the
+        # stdlib decoder behind response.json() on payloads like CV history
+        return orjson.loads(response.content)
     
     def _refresh_token(self) -> bool:
         """Attempt to refresh the access token."""
@@ -64,13 +156,13 @@ class APIClient:
             return False
         
         try:
-            response = requests.post(
-                f"{self.base_url}/auth/refresh",
-                json={"refresh_token": refresh_token}
+            response = self.client.post(
+                "/auth/refresh",
+                content=self._json({"refresh_token": refresh_token})
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 st.session_state[config.TOKEN_KEY] = data["access_token"]
                 st.session_state[config.REFRESH_TOKEN_KEY] = data["refresh_token"]
                 return True
@@ -81,6 +173,7 @@ class APIClient:
     
     def _clear_session(self):
         """Clear authentication session."""
+        self._get_cache.clear()
         for key in [config.TOKEN_KEY, config.REFRESH_TOKEN_KEY, config.USER_KEY]:
             if key in st.session_state:
                 del st.session_state[key]
@@ -89,18 +182,18 @@ class APIClient:
     
     def signup(self, email: str, password: str) -> Dict[str, Any]:
         """Register a new user."""
-        response = requests.post(
-            f"{self.base_url}/auth/signup",
-            json={"email": email, "password": password},
+        response = self.client.post(
+            "/auth/signup",
+            content=self._json({"email": email, "password": password}),
             timeout=30
         )
         return self._handle_response(response)
     
     def login(self, email: str, password: str) -> Dict[str, Any]:
         """Login user and get tokens."""
-        response = requests.post(
-            f"{self.base_url}/auth/login",
-            json={"email": email, "password": password},
+        response = self.client.post(
+            "/auth/login",
+            content=self._json({"email": email, "password": password}),
             timeout=30
         )
         data = self._handle_response(response)
@@ -118,9 +211,9 @@ class APIClient:
     def logout(self):
         """Logout user."""
         try:
-            requests.post(
-                f"{self.base_url}/auth/logout",
-                headers=self._get_headers()
+            self._request(
+                "POST",
+                "/auth/logout",
             )
         except:
             pass
@@ -129,9 +222,9 @@ class APIClient:
     
     def get_current_user(self) -> Dict[str, Any]:
         """Get current user info."""
-        response = requests.get(
-            f"{self.base_url}/auth/me",
-            headers=self._get_headers(),
+        response = self._request(
+            "GET",
+            "/auth/me",
             timeout=30
         )
         return self._handle_response(response)
@@ -144,12 +237,15 @@ class APIClient:
     
     def get_profile(self) -> Optional[Dict[str, Any]]:
         """Get user profile."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/profile/",
-                headers=self._get_headers()
+        def fetch():
+            response = self._request(
+                "GET",
+                "/profile/",
             )
             return self._handle_response(response)
+        
+        try:
+            return self._cached_get(("profile",), fetch)
         except Exception as e:
             if "not found" in str(e).lower():
                 return None
@@ -157,248 +253,333 @@ class APIClient:
     
     def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create user profile."""
-        response = requests.post(
-            f"{self.base_url}/profile/",
-            headers=self._get_headers(),
-            json=profile_data
+        response = self._request(
+            "POST",
+            "/profile/",
+            content=self._json(profile_data)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def update_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update user profile."""
-        response = requests.put(
-            f"{self.base_url}/profile/",
-            headers=self._get_headers(),
-            json=profile_data
+        response = self._request(
+            "PUT",
+            "/profile/",
+            content=self._json(profile_data)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
+    
+    def bulk_update_profile(self, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a batched profile patch in one request.
+        
+        patch = {"set": {...sections to replace...},
+                 "add": {...entries to append...}}
+        
+        A wizard submitting several education/project/achievement entries
+        flushes them here in one round-trip instead of one POST each.
+        """
+        response = self._request(
+            "PATCH",
+            "/profile/bulk",
+            content=self._json(patch)
+        )
+        return self._mutate(response)
     
     def add_education(self, education: Dict[str, Any]) -> Dict[str, Any]:
         """Add education entry."""
-        response = requests.post(
-            f"{self.base_url}/profile/education",
-            headers=self._get_headers(),
-            json=education
-        )
-        return self._handle_response(response)
+        return self.bulk_update_profile({"add": {"education": [education]}})
     
     def update_education(self, index: int, education: Dict[str, Any]) -> Dict[str, Any]:
         """Update education entry."""
-        response = requests.put(
-            f"{self.base_url}/profile/education/{index}",
-            headers=self._get_headers(),
-            json=education
+        response = self._request(
+            "PUT",
+            f"/profile/education/{index}",
+            content=self._json(education)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def delete_education(self, index: int) -> Dict[str, Any]:
         """Delete education entry."""
-        response = requests.delete(
-            f"{self.base_url}/profile/education/{index}",
-            headers=self._get_headers()
+        response = self._request(
+            "DELETE",
+            f"/profile/education/{index}",
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def update_skills(self, skills: Dict[str, Any]) -> Dict[str, Any]:
         """Update skills section."""
-        response = requests.put(
-            f"{self.base_url}/profile/skills",
-            headers=self._get_headers(),
-            json=skills
+        response = self._request(
+            "PUT",
+            "/profile/skills",
+            content=self._json(skills)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def add_project(self, project: Dict[str, Any]) -> Dict[str, Any]:
         """Add project entry."""
-        response = requests.post(
-            f"{self.base_url}/profile/projects",
-            headers=self._get_headers(),
-            json=project
-        )
-        return self._handle_response(response)
+        return self.bulk_update_profile({"add": {"projects": [project]}})
     
     def update_project(self, index: int, project: Dict[str, Any]) -> Dict[str, Any]:
         """Update project entry."""
-        response = requests.put(
-            f"{self.base_url}/profile/projects/{index}",
-            headers=self._get_headers(),
-            json=project
+        response = self._request(
+            "PUT",
+            f"/profile/projects/{index}",
+            content=self._json(project)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def delete_project(self, index: int) -> Dict[str, Any]:
         """Delete project entry."""
-        response = requests.delete(
-            f"{self.base_url}/profile/projects/{index}",
-            headers=self._get_headers()
+        response = self._request(
+            "DELETE",
+            f"/profile/projects/{index}",
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def add_internship(self, internship: Dict[str, Any]) -> Dict[str, Any]:
         """Add internship entry."""
-        response = requests.post(
-            f"{self.base_url}/profile/internships",
-            headers=self._get_headers(),
-            json=internship
-        )
-        return self._handle_response(response)
+        return self.bulk_update_profile({"add": {"internships": [internship]}})
     
     def update_internship(self, index: int, internship: Dict[str, Any]) -> Dict[str, Any]:
         """Update internship entry."""
-        response = requests.put(
-            f"{self.base_url}/profile/internships/{index}",
-            headers=self._get_headers(),
-            json=internship
+        response = self._request(
+            "PUT",
+            f"/profile/internships/{index}",
+            content=self._json(internship)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def delete_internship(self, index: int) -> Dict[str, Any]:
         """Delete internship entry."""
-        response = requests.delete(
-            f"{self.base_url}/profile/internships/{index}",
-            headers=self._get_headers()
+        response = self._request(
+            "DELETE",
+            f"/profile/internships/{index}",
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def add_certification(self, certification: Dict[str, Any]) -> Dict[str, Any]:
         """Add certification entry."""
-        response = requests.post(
-            f"{self.base_url}/profile/certifications",
-            headers=self._get_headers(),
-            json=certification
-        )
-        return self._handle_response(response)
+        return self.bulk_update_profile({"add": {"certifications": [certification]}})
     
     def update_certification(self, index: int, certification: Dict[str, Any]) -> Dict[str, Any]:
         """Update certification entry."""
-        response = requests.put(
-            f"{self.base_url}/profile/certifications/{index}",
-            headers=self._get_headers(),
-            json=certification
+        response = self._request(
+            "PUT",
+            f"/profile/certifications/{index}",
+            content=self._json(certification)
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def delete_certification(self, index: int) -> Dict[str, Any]:
         """Delete certification entry."""
-        response = requests.delete(
-            f"{self.base_url}/profile/certifications/{index}",
-            headers=self._get_headers()
+        response = self._request(
+            "DELETE",
+            f"/profile/certifications/{index}",
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def add_achievement(self, achievement: str) -> Dict[str, Any]:
         """Add achievement."""
-        response = requests.post(
-            f"{self.base_url}/profile/achievements",
-            headers=self._get_headers(),
-            params={"achievement": achievement}
-        )
-        return self._handle_response(response)
+        return self.bulk_update_profile({"add": {"achievements": [achievement]}})
     
     def update_achievement(self, index: int, achievement: str) -> Dict[str, Any]:
         """Update achievement."""
-        response = requests.put(
-            f"{self.base_url}/profile/achievements/{index}",
-            headers=self._get_headers(),
+        response = self._request(
+            "PUT",
+            f"/profile/achievements/{index}",
             params={"achievement": achievement}
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def delete_achievement(self, index: int) -> Dict[str, Any]:
         """Delete achievement."""
-        response = requests.delete(
-            f"{self.base_url}/profile/achievements/{index}",
-            headers=self._get_headers()
+        response = self._request(
+            "DELETE",
+            f"/profile/achievements/{index}",
         )
+        return self._mutate(response)
+    
+    # ============== Dashboard ==============
+    
+    async def _aget(self, client: httpx.AsyncClient, path: str, **kwargs) -> Any:
+        """Async GET against the API, sharing _handle_response semantics."""
+        response = await client.get(path, headers=self._get_headers(), **kwargs)
         return self._handle_response(response)
     
+    async def _fetch_dashboard(self, recent_limit: int) -> List[Any]:
+        """Fire the independent dashboard fetches concurrently."""
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            headers={"Content-Type": "application/json"},
+            timeout=30.0,
+        ) as client:
+            return await asyncio.gather(
+                self._aget(client, "/profile/"),
+                self._aget(client, "/cv/history/summary"),
+                self._aget(client, "/cv/history", params={"limit": recent_limit}),
+                return_exceptions=True,
+            )
+    
+    def dashboard_bundle(self, recent_limit: int = 5) -> tuple:
+        """
+        Fetch profile, history stats and recent CVs in parallel.
+        
+        The calls are independent, so total latency is the slowest
+        round-trip instead of their sum, and the metrics come from the
+        tiny summary endpoint rather than full CV documents. Returns
+        (profile, summary, recent) with profile None when no profile
+        exists yet.
+        """
+        profile, summary, recent = asyncio.run(self._fetch_dashboard(recent_limit))
+        if isinstance(profile, Exception):
+            if "not found" in str(profile).lower():
+                profile = None
+            else:
+                raise profile
+        if isinstance(summary, Exception):
+            raise summary
+        if isinstance(recent, Exception):
+            raise recent
+        return profile, summary, recent
+    
     # ============== CV Generation ==============
     
     def generate_cv(self, job_description: str) -> Dict[str, Any]:
         """Generate CV based on job description."""
-        response = requests.post(
-            f"{self.base_url}/cv/generate",
-            headers=self._get_headers(),
-            json={"job_description": job_description},
+        response = self._request(
+            "POST",
+            "/cv/generate",
+            content=self._json({"job_description": job_description}),
             timeout=60  # CV generation can take time
         )
-        return self._handle_response(response)
+        return self._mutate(response)
     
     def analyze_ats(self, job_description: str) -> Dict[str, Any]:
         """Analyze ATS compatibility."""
-        response = requests.get(
-            f"{self.base_url}/cv/analyze",
-            headers=self._get_headers(),
+        response = self._request(
+            "GET",
+            "/cv/analyze",
             params={"job_description": job_description},
             timeout=30
         )
         return self._handle_response(response)
     
     def get_cv_history(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get CV generation history."""
-        response = requests.get(
-            f"{self.base_url}/cv/history",
-            headers=self._get_headers(),
-            params={"limit": limit}
-        )
-        return self._handle_response(response)
+        """Get CV generation history, revalidating with If-None-Match."""
+        etag_key = (st.session_state.get(config.TOKEN_KEY), "history", limit)
+
+        def fetch():
+            known = self._etag_cache.get(etag_key)
+            response = self._request(
+                "GET",
+                "/cv/history",
+                params={"limit": limit},
+                headers={"If-None-Match": known[0]} if known else None,
+            )
+            if response.status_code == 304 and known:
+                return known[1]
+            history = self._handle_response(response)
+            etag = response.headers.get("etag")
+            if etag:
+                self._etag_cache[etag_key] = (etag, history)
+            return history
+
+        return self._cached_get(("history", limit), fetch)
     
     def get_cv(self, cv_id: str) -> Dict[str, Any]:
         """Get specific CV."""
-        response = requests.get(
-            f"{self.base_url}/cv/{cv_id}",
-            headers=self._get_headers()
-        )
-        return self._handle_response(response)
+        def fetch():
+            response = self._request(
+                "GET",
+                f"/cv/{cv_id}",
+            )
+            return self._handle_response(response)
+        
+        return self._cached_get(("cv", cv_id), fetch)
     
     def get_cv_latex(self, cv_id: str) -> str:
         """Get CV LaTeX code."""
-        response = requests.get(
-            f"{self.base_url}/cv/{cv_id}/latex",
-            headers=self._get_headers()
-        )
-        if response.status_code >= 400:
-            raise Exception("Failed to get LaTeX code")
-        return response.text
+        def fetch():
+            response = self._request(
+                "GET",
+                f"/cv/{cv_id}/latex",
+            )
+            if response.status_code >= 400:
+                raise Exception("Failed to get LaTeX code")
+            return response.text
+        
+        return self._cached_get(("cv_latex", cv_id), fetch)
     
-    def download_pdf(self, cv_id: str) -> bytes:
-        """Download CV as PDF."""
-        response = requests.get(
-            f"{self.base_url}/cv/{cv_id}/download-pdf",
+    def _download_file(self, path: str, default_error: str) -> io.BytesIO:
+        """
+        Stream a binary download into a BytesIO.
+        
+        Chunked copy instead of response.content avoids materializing a
+        second full copy of the body, and st.download_button accepts the
+        file-like object directly.
+        """
+        with self.client.stream(
+            "GET",
+            path,
             headers=self._get_headers(),
             timeout=60
-        )
-        if response.status_code >= 400:
-            try:
-                error = response.json().get("detail", "Failed to download PDF")
-            except:
-                error = "Failed to download PDF"
-            raise Exception(error)
-        return response.content
-    
-    def download_docx(self, cv_id: str) -> bytes:
+        ) as response:
+            if response.status_code >= 400:
+                response.read()
+                try:
+                    error = orjson.loads(response.content).get("detail", default_error)
+                except (ValueError, AttributeError):
+                    error = default_error
+                raise Exception(error)
+            buf = io.BytesIO()
+            for chunk in response.iter_bytes():
+                buf.write(chunk)
+        buf.seek(0)
+        return buf
+    
+    def download_pdf(self, cv_id: str) -> io.BytesIO:
+        """Download CV as PDF."""
+        return self._download_file(f"/cv/{cv_id}/download-pdf", "Failed to download PDF")
+    
+    def download_docx(self, cv_id: str) -> io.BytesIO:
         """Download CV as DOCX."""
-        response = requests.get(
-            f"{self.base_url}/cv/{cv_id}/download-docx",
-            headers=self._get_headers(),
-            timeout=60
+        return self._download_file(f"/cv/{cv_id}/download-docx", "Failed to download DOCX")
+
+    def start_render(self, cv_id: str, fmt: str) -> Dict[str, Any]:
+        """Start a background PDF/DOCX render; returns a task id or sync marker."""
+        response = self._request(
+            "POST",
+            f"/cv/{cv_id}/render-async",
+            params={"fmt": fmt},
         )
-        if response.status_code >= 400:
-            try:
-                error = response.json().get("detail", "Failed to download DOCX")
-            except:
-                error = "Failed to download DOCX"
-            raise Exception(error)
-        return response.content
-    
-    def delete_cv(self, cv_id: str) -> Dict[str, Any]:
-        """Delete a CV."""
-        response = requests.delete(
-            f"{self.base_url}/cv/{cv_id}",
-            headers=self._get_headers()
+        return self._handle_response(response)
+
+    def poll_render(self, task_id: str) -> Dict[str, Any]:
+        """Fetch background render status (deliberately never cached)."""
+        response = self._request(
+            "GET",
+            f"/tasks/status/{task_id}",
         )
         return self._handle_response(response)
 
+    def download_render(self, task_id: str, fmt: str) -> io.BytesIO:
+        """Download the artifact produced by a finished render task."""
+        return self._download_file(
+            f"/tasks/download/{task_id}?fmt={fmt}",
+            f"Failed to download {fmt.upper()}"
+        )
+    
+    def delete_cv(self, cv_id: str, history_limit: int = 0) -> Dict[str, Any]:
+        """Delete a CV; a positive history_limit returns the updated history too."""
+        response = self._request(
+            "DELETE",
+            f"/cv/{cv_id}",
+            params={"history_limit": history_limit} if history_limit else None,
+        )
+        return self._mutate(response)
+
 
 # Singleton instance
 api_client = APIClient()
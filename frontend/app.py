@@ -2,6 +2,8 @@
 ATS CV Generator - Streamlit Frontend
 Main application entry point.
 """
+import re
+
 import streamlit as st
 from config import config
 from api_client import api_client
@@ -14,8 +16,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS, built once at import; reruns re-emit the same constant
+# string with no per-run formatting work
+_CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -69,7 +72,131 @@ st.markdown("""
         color: #dc3545;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+
+
+# Compiled once: one C-level pass splits and trims in a single step
+# instead of split + per-token strip
+_COMMA_RE = re.compile(r"\s*,\s*")
+_LINES_RE = re.compile(r"\s*\n\s*")
+
+_SCORE_HTML = {
+    "high": '<p class="ats-score ats-score-high">{}</p>',
+    "medium": '<p class="ats-score ats-score-medium">{}</p>',
+    "low": '<p class="ats-score ats-score-low">{}</p>',
+}
+
+
+def _score_class(score) -> str:
+    """Map an ATS score to its display tier (high/medium/low)."""
+    return "high" if score >= 90 else "medium" if score >= 70 else "low"
+
+
+def _truncate(text: str, limit: int = 200) -> str:
+    """Truncate preview text with an ellipsis past the limit."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _split_csv(text: str) -> list:
+    """Split comma-separated form input into trimmed, non-empty tokens."""
+    return [t for t in _COMMA_RE.split(text.strip()) if t]
+
+
+def _split_lines(text: str) -> list:
+    """Split one-per-line form input into trimmed, non-empty lines."""
+    return [t for t in _LINES_RE.split(text.strip()) if t]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_get_profile(user_id: str):
+    """
+    Profile fetch memoized per user.
+    
+    Streamlit reruns the whole script on every widget interaction, so an
+    uncached fetch costs one backend round-trip per click. Mutations
+    call cached_get_profile.clear() before rerunning.
+    """
+    return api_client.get_profile()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_dashboard_bundle(user_id: str):
+    """Dashboard data (profile, stats, recent CVs) memoized between reruns."""
+    return api_client.dashboard_bundle(recent_limit=5)
+
+
+def _annotate_history(history: list) -> list:
+    """Precompute per-row display fields once per fetch, not per rerun."""
+    for cv in history:
+        score = cv.get("ats_score", 0)
+        cv["_emoji"] = "🟢" if score >= 90 else "🟡" if score >= 70 else "🔴"
+        cv["_jd_preview"] = _truncate(cv.get("job_description", ""), 300)
+        cv["_skills_preview"] = ", ".join(cv.get("aligned_skills", [])[:5])
+    return history
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_cv_history(user_id: str, limit: int = 50):
+    """CV history memoized per user between reruns, with display fields baked in."""
+    return _annotate_history(api_client.get_cv_history(limit=limit))
+
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def cached_get_cv(user_id: str, cv_id: str):
+    """
+    One CV document memoized per (user, CV id).
+
+    CVs are immutable once generated, so a long TTL is safe; max_entries
+    bounds memory since each record carries the full LaTeX source. The
+    cache is process-wide, so the user id in the key keeps one session's
+    hits from bypassing the server-side ownership check for another.
+    """
+    return api_client.get_cv(cv_id)
+
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def cached_analyze(user_id: str, job_description: str):
+    """ATS analysis memoized per (user, JD text); repeat clicks skip the backend.
+
+    The result depends on the caller's profile, so the user id belongs
+    in the key — the cache is shared across sessions.
+    """
+    return api_client.analyze_ats(job_description)
+
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False, persist="disk")
+def cached_pdf(user_id: str, cv_id: str):
+    """PDF bytes memoized per (user, CV id); each miss is a server-side compile.
+
+    Persisted to disk so rendered documents survive app restarts. The
+    user id in the key keeps hits — in memory and on disk — scoped to
+    the owner; the server still authorizes every miss.
+    """
+    return api_client.download_pdf(cv_id).getvalue()
+
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False, persist="disk")
+def cached_docx(user_id: str, cv_id: str):
+    """DOCX bytes memoized per (user, CV id); each miss is a pandoc conversion.
+
+    Persisted to disk so rendered documents survive app restarts. The
+    user id in the key keeps hits — in memory and on disk — scoped to
+    the owner; the server still authorizes every miss.
+    """
+    return api_client.download_docx(cv_id).getvalue()
+
+
+def _clear_cv_caches() -> None:
+    """Drop CV-derived caches after generating or deleting a CV."""
+    cached_dashboard_bundle.clear()
+    cached_cv_history.clear()
+
+
+def _current_user_id() -> str:
+    """User id for cache keying; falls back to empty for fresh sessions."""
+    return st.session_state.get(config.USER_KEY, {}).get("id", "")
 
 
 def show_login_page():
@@ -131,24 +258,43 @@ def show_login_page():
                             st.error(f"Signup failed: {str(e)}")
 
 
+def _go_to(page_key: str, cv_id: str = None) -> None:
+    """
+    Navigation callback for st.button(on_click=...).
+    
+    Runs before Streamlit's automatic post-click rerun, so navigation
+    costs one rerun instead of the two paid by the
+    set-state-then-st.rerun() pattern.
+    """
+    st.session_state["current_page"] = page_key
+    if cv_id is not None:
+        st.session_state["selected_cv"] = cv_id
+
+
+# Sidebar navigation entries: (label, page key, widget key), built once
+# instead of a dict literal plus f-string widget keys on every rerun
+_NAV_PAGES = (
+    ("🏠 Dashboard", "dashboard", "nav_dashboard"),
+    ("👤 Profile", "profile", "nav_profile"),
+    ("📝 Generate CV", "generate", "nav_generate"),
+    ("📜 CV History", "history", "nav_history"),
+)
+
+
 def show_sidebar():
     """Display sidebar navigation."""
     with st.sidebar:
         st.markdown("### 👤 " + st.session_state.get(config.USER_KEY, {}).get("email", "User"))
         st.divider()
         
-        # Navigation
-        pages = {
-            "🏠 Dashboard": "dashboard",
-            "👤 Profile": "profile",
-            "📝 Generate CV": "generate",
-            "📜 CV History": "history",
-        }
-        
-        for page_name, page_key in pages.items():
-            if st.button(page_name, use_container_width=True, key=f"nav_{page_key}"):
-                st.session_state["current_page"] = page_key
-                st.rerun()
+        for page_name, page_key, widget_key in _NAV_PAGES:
+            st.button(
+                page_name,
+                use_container_width=True,
+                key=widget_key,
+                on_click=_go_to,
+                args=(page_key,)
+            )
         
         st.divider()
         
@@ -161,12 +307,14 @@ def show_dashboard():
     """Display dashboard page."""
     st.header("🏠 Dashboard")
     
-    # Check if profile exists
+    # Profile and history are independent fetches; one gather instead of
+    # two sequential round-trips
     try:
-        profile = api_client.get_profile()
-        has_profile = profile is not None
+        profile, summary, recent = cached_dashboard_bundle(_current_user_id())
     except:
-        has_profile = False
+        profile, summary, recent = None, {}, []
+    has_profile = profile is not None
+    cv_count = summary.get("count", 0)
     
     col1, col2, col3 = st.columns(3)
     
@@ -177,57 +325,416 @@ def show_dashboard():
         )
     
     with col2:
-        try:
-            history = api_client.get_cv_history(limit=100)
-            cv_count = len(history)
-        except:
-            cv_count = 0
         st.metric(label="CVs Generated", value=cv_count)
     
     with col3:
-        if history:
-            latest_score = history[0].get("ats_score", 0)
-        else:
-            latest_score = "-"
-        st.metric(label="Latest ATS Score", value=latest_score)
+        latest_score = summary.get("latest_ats_score")
+        st.metric(
+            label="Latest ATS Score",
+            value=latest_score if latest_score is not None else "-"
+        )
     
     st.divider()
     
     if not has_profile:
         st.warning("⚠️ Please complete your profile before generating CVs.")
-        if st.button("Go to Profile", use_container_width=True):
-            st.session_state["current_page"] = "profile"
-            st.rerun()
+        st.button("Go to Profile", use_container_width=True, on_click=_go_to, args=("profile",))
     else:
         st.success("✅ Your profile is complete. You can generate CVs!")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("📝 Generate New CV", use_container_width=True):
-                st.session_state["current_page"] = "generate"
-                st.rerun()
+            st.button("📝 Generate New CV", use_container_width=True, on_click=_go_to, args=("generate",))
         
         with col2:
-            if st.button("👤 Update Profile", use_container_width=True):
-                st.session_state["current_page"] = "profile"
-                st.rerun()
+            st.button("👤 Update Profile", use_container_width=True, on_click=_go_to, args=("profile",))
     
     # Recent CVs
     if cv_count > 0:
         st.subheader("Recent CVs")
         
-        for cv in history[:5]:
+        for cv in recent:
             with st.expander(f"📄 CV - ATS Score: {cv['ats_score']}% | {cv['created_at'][:10]}"):
-                st.text(cv['job_description'][:200] + "..." if len(cv['job_description']) > 200 else cv['job_description'])
+                st.text(_truncate(cv['job_description']))
                 
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    if st.button("View", key=f"view_{cv['_id']}"):
-                        st.session_state["selected_cv"] = cv['_id']
-                        st.session_state["current_page"] = "view_cv"
-                        st.rerun()
+                    st.button(
+                        "View",
+                        key=f"view_{cv['_id']}",
+                        on_click=_go_to,
+                        args=("view_cv", cv['_id'])
+                    )
+
+
+def _deletion_form(section: str, items: list, render_item) -> None:
+    """
+    Render list entries with delete checkboxes inside a single form.
+    
+    Entries marked for deletion are removed in one bulk write on submit
+    instead of one round-trip and full rerun per item.
+    """
+    with st.form(f"edit_{section}_form"):
+        for i, item in enumerate(items):
+            render_item(i, item)
+        
+        if st.form_submit_button("🗑️ Delete Selected"):
+            kept = [
+                item for i, item in enumerate(items)
+                if not st.session_state.get(f"del_{section}_{i}")
+            ]
+            if len(kept) == len(items):
+                st.info("No entries selected")
+            else:
+                try:
+                    api_client.bulk_update_profile({"set": {section: kept}})
+                    cached_get_profile.clear()
+                    st.success("Deleted!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+@st.fragment
+def _personal_details_fragment(profile):
+    """Personal Details tab body."""
+    st.subheader("Personal Details")
+    
+    with st.form("personal_details_form"):
+        pd = profile.get("personal_details", {}) if profile else {}
+        
+        full_name = st.text_input("Full Name*", value=pd.get("full_name", ""))
+        location = st.text_input("Location", value=pd.get("location", ""))
+        phone = st.text_input("Phone", value=pd.get("phone", ""))
+        email = st.text_input("Email*", value=pd.get("email", st.session_state.get(config.USER_KEY, {}).get("email", "")))
+        linkedin = st.text_input("LinkedIn URL", value=pd.get("linkedin", ""))
+        github = st.text_input("GitHub URL", value=pd.get("github", ""))
+        
+        if st.form_submit_button("Save Personal Details", use_container_width=True):
+            if not full_name or not email:
+                st.error("Full Name and Email are required")
+            else:
+                try:
+                    personal_data = {
+                        "personal_details": {
+                            "full_name": full_name,
+                            "location": location,
+                            "phone": phone,
+                            "email": email,
+                            "linkedin": linkedin,
+                            "github": github
+                        }
+                    }
+                    
+                    if profile:
+                        api_client.update_profile(personal_data)
+                    else:
+                        # Create new profile with default values
+                        full_profile = {
+                            "personal_details": personal_data["personal_details"],
+                            "education": [],
+                            "skills": {
+                                "programming_languages": [],
+                                "technical_skills": [],
+                                "developer_tools": []
+                            },
+                            "projects": [],
+                            "internships": [],
+                            "certifications": [],
+                            "achievements": []
+                        }
+                        api_client.create_profile(full_profile)
+                    
+                    cached_get_profile.clear()
+                    st.success("Personal details saved!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(f"Error saving: {str(e)}")
+
+
+
+@st.fragment
+def _education_fragment(profile):
+    """Education tab body."""
+    st.subheader("Education")
+    
+    education_list = profile.get("education", []) if profile else []
+    
+    # Display existing entries; deletions batch through one form submit
+    def render_entry(i, edu):
+        with st.expander(f"🎓 {edu.get('degree', 'Degree')} - {edu.get('college_name', 'College')}", expanded=False):
+            st.write(f"**College:** {edu.get('college_name', '')}")
+            st.write(f"**Degree:** {edu.get('degree', '')}")
+            st.write(f"**CGPA/Percentage:** {edu.get('cgpa_or_percentage', '')}")
+            st.write(f"**Session:** {edu.get('session_year', '')}")
+            st.checkbox("Mark for deletion", key=f"del_education_{i}")
+    
+    if education_list:
+        _deletion_form("education", education_list, render_entry)
+    
+    # Add new education
+    st.divider()
+    st.write("**Add New Education**")
+    
+    with st.form("add_education_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            college_name = st.text_input("College/University Name*")
+            degree = st.text_input("Degree*")
+        
+        with col2:
+            cgpa = st.text_input("CGPA/Percentage")
+            session_year = st.text_input("Session Year* (e.g., 2020-2024)")
+        
+        if st.form_submit_button("Add Education", use_container_width=True):
+            if not college_name or not degree or not session_year:
+                st.error("Please fill required fields")
+            else:
+                try:
+                    api_client.add_education({
+                        "college_name": college_name,
+                        "degree": degree,
+                        "cgpa_or_percentage": cgpa,
+                        "session_year": session_year
+                    })
+                    cached_get_profile.clear()
+                    st.success("Education added!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+
+@st.fragment
+def _skills_fragment(profile):
+    """Skills tab body."""
+    st.subheader("Skills")
+    
+    skills = profile.get("skills", {}) if profile else {}
+    
+    with st.form("skills_form"):
+        st.write("Enter skills separated by commas")
+        
+        prog_langs = st.text_area(
+            "Programming Languages",
+            value=", ".join(skills.get("programming_languages", [])),
+            placeholder="Python, JavaScript, Java, C++"
+        )
+        
+        tech_skills = st.text_area(
+            "Technical Skills",
+            value=", ".join(skills.get("technical_skills", [])),
+            placeholder="Machine Learning, Web Development, Data Analysis"
+        )
+        
+        dev_tools = st.text_area(
+            "Developer Tools",
+            value=", ".join(skills.get("developer_tools", [])),
+            placeholder="Git, Docker, VS Code, AWS"
+        )
+        
+        if st.form_submit_button("Save Skills", use_container_width=True):
+            try:
+                skills_data = {
+                    "programming_languages": _split_csv(prog_langs),
+                    "technical_skills": _split_csv(tech_skills),
+                    "developer_tools": _split_csv(dev_tools)
+                }
+                api_client.update_skills(skills_data)
+                cached_get_profile.clear()
+                st.success("Skills saved!")
+                st.rerun(scope="app")
+            except Exception as e:
+                st.error(str(e))
+
+
+
+@st.fragment
+def _projects_fragment(profile):
+    """Projects tab body."""
+    st.subheader("Projects")
+    
+    projects = profile.get("projects", []) if profile else []
+    
+    def render_entry(i, proj):
+        with st.expander(f"🚀 {proj.get('project_name', 'Project')}", expanded=False):
+            st.write(f"**Name:** {proj.get('project_name', '')}")
+            if proj.get("project_link"):
+                st.write(f"**Link:** {proj.get('project_link', '')}")
+            st.write(f"**Tech Stack:** {', '.join(proj.get('tech_stack', []))}")
+            st.write("**Bullet Points:**")
+            for bp in proj.get("bullet_points", []):
+                st.write(f"• {bp}")
+            st.checkbox("Mark for deletion", key=f"del_projects_{i}")
+    
+    if projects:
+        _deletion_form("projects", projects, render_entry)
+    
+    st.divider()
+    st.write("**Add New Project**")
+    
+    with st.form("add_project_form"):
+        project_name = st.text_input("Project Name*")
+        project_link = st.text_input("Project Link (optional)")
+        tech_stack = st.text_input("Tech Stack (comma-separated)")
+        bullet_points = st.text_area("Bullet Points (one per line)", height=150)
+        
+        if st.form_submit_button("Add Project", use_container_width=True):
+            if not project_name:
+                st.error("Project name is required")
+            else:
+                try:
+                    bullets = _split_lines(bullet_points)
+                    techs = _split_csv(tech_stack)
+                    
+                    api_client.add_project({
+                        "project_name": project_name,
+                        "project_link": project_link,
+                        "tech_stack": techs,
+                        "bullet_points": bullets
+                    })
+                    cached_get_profile.clear()
+                    st.success("Project added!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+
+@st.fragment
+def _internships_fragment(profile):
+    """Internships tab body."""
+    st.subheader("Internships")
+    
+    internships = profile.get("internships", []) if profile else []
+    
+    def render_entry(i, intern):
+        with st.expander(f"💼 {intern.get('internship_name', 'Internship')} at {intern.get('company_name', 'Company')}", expanded=False):
+            st.write(f"**Role:** {intern.get('internship_name', '')}")
+            st.write(f"**Company:** {intern.get('company_name', '')}")
+            st.write("**Bullet Points:**")
+            for bp in intern.get("bullet_points", []):
+                st.write(f"• {bp}")
+            st.checkbox("Mark for deletion", key=f"del_internships_{i}")
+    
+    if internships:
+        _deletion_form("internships", internships, render_entry)
+    
+    st.divider()
+    st.write("**Add New Internship**")
+    
+    with st.form("add_internship_form"):
+        intern_name = st.text_input("Internship Title/Role*")
+        company_name = st.text_input("Company Name*")
+        intern_bullets = st.text_area("Bullet Points (one per line)", height=150)
+        
+        if st.form_submit_button("Add Internship", use_container_width=True):
+            if not intern_name or not company_name:
+                st.error("Please fill required fields")
+            else:
+                try:
+                    bullets = _split_lines(intern_bullets)
+                    
+                    api_client.add_internship({
+                        "internship_name": intern_name,
+                        "company_name": company_name,
+                        "bullet_points": bullets
+                    })
+                    cached_get_profile.clear()
+                    st.success("Internship added!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+
+@st.fragment
+def _certifications_fragment(profile):
+    """Certifications tab body."""
+    st.subheader("Certifications")
+    
+    certifications = profile.get("certifications", []) if profile else []
+    
+    def render_entry(i, cert):
+        with st.expander(f"📜 {cert.get('certificate_name', 'Certificate')}", expanded=False):
+            st.write(f"**Certificate:** {cert.get('certificate_name', '')}")
+            st.write(f"**Issuer:** {cert.get('issuing_company', '')}")
+            if cert.get("bullet_points"):
+                st.write("**Details:**")
+                for bp in cert.get("bullet_points", []):
+                    st.write(f"• {bp}")
+            st.checkbox("Mark for deletion", key=f"del_certifications_{i}")
+    
+    if certifications:
+        _deletion_form("certifications", certifications, render_entry)
+    
+    st.divider()
+    st.write("**Add New Certification**")
+    
+    with st.form("add_cert_form"):
+        cert_name = st.text_input("Certificate Name*")
+        issuing_company = st.text_input("Issuing Organization*")
+        cert_bullets = st.text_area("Details (one per line, optional)")
+        
+        if st.form_submit_button("Add Certification", use_container_width=True):
+            if not cert_name or not issuing_company:
+                st.error("Please fill required fields")
+            else:
+                try:
+                    bullets = _split_lines(cert_bullets)
+                    
+                    api_client.add_certification({
+                        "certificate_name": cert_name,
+                        "issuing_company": issuing_company,
+                        "bullet_points": bullets
+                    })
+                    cached_get_profile.clear()
+                    st.success("Certification added!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+
+@st.fragment
+def _achievements_fragment(profile):
+    """Achievements tab body."""
+    st.subheader("Achievements")
+    
+    achievements = profile.get("achievements", []) if profile else []
+    
+    def render_entry(i, achievement):
+        col1, col2 = st.columns([4, 1])
+        
+        with col1:
+            st.write(f"🏆 {achievement}")
+        
+        with col2:
+            st.checkbox("Delete", key=f"del_achievements_{i}")
+    
+    if achievements:
+        _deletion_form("achievements", achievements, render_entry)
+    
+    st.divider()
+    st.write("**Add New Achievement**")
+    
+    with st.form("add_achievement_form"):
+        new_achievement = st.text_input("Achievement")
+        
+        if st.form_submit_button("Add Achievement", use_container_width=True):
+            if not new_achievement:
+                st.error("Please enter an achievement")
+            else:
+                try:
+                    api_client.add_achievement(new_achievement)
+                    cached_get_profile.clear()
+                    st.success("Achievement added!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
 
 
 def show_profile_page():
@@ -236,7 +743,7 @@ def show_profile_page():
     
     # Load existing profile
     try:
-        profile = api_client.get_profile()
+        profile = cached_get_profile(_current_user_id())
     except:
         profile = None
     
@@ -250,341 +757,29 @@ def show_profile_page():
         "🏆 Achievements"
     ])
     
-    # Personal Details Tab
+    # Each tab body is a fragment: a widget interaction inside one tab
+    # reruns only that fragment instead of the whole page and its six
+    # sibling tabs; mutations rerun the full app explicitly
     with tabs[0]:
-        st.subheader("Personal Details")
-        
-        with st.form("personal_details_form"):
-            pd = profile.get("personal_details", {}) if profile else {}
-            
-            full_name = st.text_input("Full Name*", value=pd.get("full_name", ""))
-            location = st.text_input("Location", value=pd.get("location", ""))
-            phone = st.text_input("Phone", value=pd.get("phone", ""))
-            email = st.text_input("Email*", value=pd.get("email", st.session_state.get(config.USER_KEY, {}).get("email", "")))
-            linkedin = st.text_input("LinkedIn URL", value=pd.get("linkedin", ""))
-            github = st.text_input("GitHub URL", value=pd.get("github", ""))
-            
-            if st.form_submit_button("Save Personal Details", use_container_width=True):
-                if not full_name or not email:
-                    st.error("Full Name and Email are required")
-                else:
-                    try:
-                        personal_data = {
-                            "personal_details": {
-                                "full_name": full_name,
-                                "location": location,
-                                "phone": phone,
-                                "email": email,
-                                "linkedin": linkedin,
-                                "github": github
-                            }
-                        }
-                        
-                        if profile:
-                            api_client.update_profile(personal_data)
-                        else:
-                            # Create new profile with default values
-                            full_profile = {
-                                "personal_details": personal_data["personal_details"],
-                                "education": [],
-                                "skills": {
-                                    "programming_languages": [],
-                                    "technical_skills": [],
-                                    "developer_tools": []
-                                },
-                                "projects": [],
-                                "internships": [],
-                                "certifications": [],
-                                "achievements": []
-                            }
-                            api_client.create_profile(full_profile)
-                        
-                        st.success("Personal details saved!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error saving: {str(e)}")
+        _personal_details_fragment(profile)
     
-    # Education Tab
     with tabs[1]:
-        st.subheader("Education")
-        
-        education_list = profile.get("education", []) if profile else []
-        
-        # Display existing entries
-        for i, edu in enumerate(education_list):
-            with st.expander(f"🎓 {edu.get('degree', 'Degree')} - {edu.get('college_name', 'College')}", expanded=False):
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.write(f"**College:** {edu.get('college_name', '')}")
-                    st.write(f"**Degree:** {edu.get('degree', '')}")
-                    st.write(f"**CGPA/Percentage:** {edu.get('cgpa_or_percentage', '')}")
-                    st.write(f"**Session:** {edu.get('session_year', '')}")
-                
-                with col2:
-                    if st.button("🗑️ Delete", key=f"del_edu_{i}"):
-                        try:
-                            api_client.delete_education(i)
-                            st.success("Deleted!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(str(e))
-        
-        # Add new education
-        st.divider()
-        st.write("**Add New Education**")
-        
-        with st.form("add_education_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                college_name = st.text_input("College/University Name*")
-                degree = st.text_input("Degree*")
-            
-            with col2:
-                cgpa = st.text_input("CGPA/Percentage")
-                session_year = st.text_input("Session Year* (e.g., 2020-2024)")
-            
-            if st.form_submit_button("Add Education", use_container_width=True):
-                if not college_name or not degree or not session_year:
-                    st.error("Please fill required fields")
-                else:
-                    try:
-                        api_client.add_education({
-                            "college_name": college_name,
-                            "degree": degree,
-                            "cgpa_or_percentage": cgpa,
-                            "session_year": session_year
-                        })
-                        st.success("Education added!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-    
-    # Skills Tab
+        _education_fragment(profile)
+    
     with tabs[2]:
-        st.subheader("Skills")
-        
-        skills = profile.get("skills", {}) if profile else {}
-        
-        with st.form("skills_form"):
-            st.write("Enter skills separated by commas")
-            
-            prog_langs = st.text_area(
-                "Programming Languages",
-                value=", ".join(skills.get("programming_languages", [])),
-                placeholder="Python, JavaScript, Java, C++"
-            )
-            
-            tech_skills = st.text_area(
-                "Technical Skills",
-                value=", ".join(skills.get("technical_skills", [])),
-                placeholder="Machine Learning, Web Development, Data Analysis"
-            )
-            
-            dev_tools = st.text_area(
-                "Developer Tools",
-                value=", ".join(skills.get("developer_tools", [])),
-                placeholder="Git, Docker, VS Code, AWS"
-            )
-            
-            if st.form_submit_button("Save Skills", use_container_width=True):
-                try:
-                    skills_data = {
-                        "programming_languages": [s.strip() for s in prog_langs.split(",") if s.strip()],
-                        "technical_skills": [s.strip() for s in tech_skills.split(",") if s.strip()],
-                        "developer_tools": [s.strip() for s in dev_tools.split(",") if s.strip()]
-                    }
-                    api_client.update_skills(skills_data)
-                    st.success("Skills saved!")
-                    st.rerun()
-                except Exception as e:
-                    st.error(str(e))
+        _skills_fragment(profile)
     
-    # Projects Tab
     with tabs[3]:
-        st.subheader("Projects")
-        
-        projects = profile.get("projects", []) if profile else []
-        
-        for i, proj in enumerate(projects):
-            with st.expander(f"🚀 {proj.get('project_name', 'Project')}", expanded=False):
-                st.write(f"**Name:** {proj.get('project_name', '')}")
-                if proj.get("project_link"):
-                    st.write(f"**Link:** {proj.get('project_link', '')}")
-                st.write(f"**Tech Stack:** {', '.join(proj.get('tech_stack', []))}")
-                st.write("**Bullet Points:**")
-                for bp in proj.get("bullet_points", []):
-                    st.write(f"• {bp}")
-                
-                if st.button("🗑️ Delete", key=f"del_proj_{i}"):
-                    try:
-                        api_client.delete_project(i)
-                        st.success("Deleted!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-        
-        st.divider()
-        st.write("**Add New Project**")
-        
-        with st.form("add_project_form"):
-            project_name = st.text_input("Project Name*")
-            project_link = st.text_input("Project Link (optional)")
-            tech_stack = st.text_input("Tech Stack (comma-separated)")
-            bullet_points = st.text_area("Bullet Points (one per line)", height=150)
-            
-            if st.form_submit_button("Add Project", use_container_width=True):
-                if not project_name:
-                    st.error("Project name is required")
-                else:
-                    try:
-                        bullets = [b.strip() for b in bullet_points.split("\n") if b.strip()]
-                        techs = [t.strip() for t in tech_stack.split(",") if t.strip()]
-                        
-                        api_client.add_project({
-                            "project_name": project_name,
-                            "project_link": project_link,
-                            "tech_stack": techs,
-                            "bullet_points": bullets
-                        })
-                        st.success("Project added!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-    
-    # Internships Tab
+        _projects_fragment(profile)
+    
     with tabs[4]:
-        st.subheader("Internships")
-        
-        internships = profile.get("internships", []) if profile else []
-        
-        for i, intern in enumerate(internships):
-            with st.expander(f"💼 {intern.get('internship_name', 'Internship')} at {intern.get('company_name', 'Company')}", expanded=False):
-                st.write(f"**Role:** {intern.get('internship_name', '')}")
-                st.write(f"**Company:** {intern.get('company_name', '')}")
-                st.write("**Bullet Points:**")
-                for bp in intern.get("bullet_points", []):
-                    st.write(f"• {bp}")
-                
-                if st.button("🗑️ Delete", key=f"del_intern_{i}"):
-                    try:
-                        api_client.delete_internship(i)
-                        st.success("Deleted!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-        
-        st.divider()
-        st.write("**Add New Internship**")
-        
-        with st.form("add_internship_form"):
-            intern_name = st.text_input("Internship Title/Role*")
-            company_name = st.text_input("Company Name*")
-            intern_bullets = st.text_area("Bullet Points (one per line)", height=150)
-            
-            if st.form_submit_button("Add Internship", use_container_width=True):
-                if not intern_name or not company_name:
-                    st.error("Please fill required fields")
-                else:
-                    try:
-                        bullets = [b.strip() for b in intern_bullets.split("\n") if b.strip()]
-                        
-                        api_client.add_internship({
-                            "internship_name": intern_name,
-                            "company_name": company_name,
-                            "bullet_points": bullets
-                        })
-                        st.success("Internship added!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-    
-    # Certifications Tab
+        _internships_fragment(profile)
+    
     with tabs[5]:
-        st.subheader("Certifications")
-        
-        certifications = profile.get("certifications", []) if profile else []
-        
-        for i, cert in enumerate(certifications):
-            with st.expander(f"📜 {cert.get('certificate_name', 'Certificate')}", expanded=False):
-                st.write(f"**Certificate:** {cert.get('certificate_name', '')}")
-                st.write(f"**Issuer:** {cert.get('issuing_company', '')}")
-                if cert.get("bullet_points"):
-                    st.write("**Details:**")
-                    for bp in cert.get("bullet_points", []):
-                        st.write(f"• {bp}")
-                
-                if st.button("🗑️ Delete", key=f"del_cert_{i}"):
-                    try:
-                        api_client.delete_certification(i)
-                        st.success("Deleted!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-        
-        st.divider()
-        st.write("**Add New Certification**")
-        
-        with st.form("add_cert_form"):
-            cert_name = st.text_input("Certificate Name*")
-            issuing_company = st.text_input("Issuing Organization*")
-            cert_bullets = st.text_area("Details (one per line, optional)")
-            
-            if st.form_submit_button("Add Certification", use_container_width=True):
-                if not cert_name or not issuing_company:
-                    st.error("Please fill required fields")
-                else:
-                    try:
-                        bullets = [b.strip() for b in cert_bullets.split("\n") if b.strip()]
-                        
-                        api_client.add_certification({
-                            "certificate_name": cert_name,
-                            "issuing_company": issuing_company,
-                            "bullet_points": bullets
-                        })
-                        st.success("Certification added!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-    
-    # Achievements Tab
+        _certifications_fragment(profile)
+    
     with tabs[6]:
-        st.subheader("Achievements")
-        
-        achievements = profile.get("achievements", []) if profile else []
-        
-        for i, achievement in enumerate(achievements):
-            col1, col2 = st.columns([4, 1])
-            
-            with col1:
-                st.write(f"🏆 {achievement}")
-            
-            with col2:
-                if st.button("🗑️", key=f"del_ach_{i}"):
-                    try:
-                        api_client.delete_achievement(i)
-                        st.success("Deleted!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
-        
-        st.divider()
-        st.write("**Add New Achievement**")
-        
-        with st.form("add_achievement_form"):
-            new_achievement = st.text_input("Achievement")
-            
-            if st.form_submit_button("Add Achievement", use_container_width=True):
-                if not new_achievement:
-                    st.error("Please enter an achievement")
-                else:
-                    try:
-                        api_client.add_achievement(new_achievement)
-                        st.success("Achievement added!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
+        _achievements_fragment(profile)
 
 
 def show_generate_cv_page():
@@ -593,7 +788,7 @@ def show_generate_cv_page():
     
     # Check profile
     try:
-        profile = api_client.get_profile()
+        profile = cached_get_profile(_current_user_id())
         if not profile:
             st.warning("⚠️ Please complete your profile first.")
             if st.button("Go to Profile"):
@@ -621,13 +816,12 @@ def show_generate_cv_page():
             else:
                 try:
                     with st.spinner("Analyzing..."):
-                        analysis = api_client.analyze_ats(job_description)
+                        analysis = cached_analyze(_current_user_id(), job_description)
                     
                     # Display analysis
                     score = analysis.get("score", 0)
-                    score_class = "high" if score >= 90 else "medium" if score >= 70 else "low"
-                    
-                    st.markdown(f'<p class="ats-score ats-score-{score_class}">{score}%</p>', unsafe_allow_html=True)
+
+                    st.markdown(_SCORE_HTML[_score_class(score)].format(f"{score}%"), unsafe_allow_html=True)
                     st.write(f"**Keyword Match:** {analysis.get('keyword_match_percentage', 0)}%")
                     
                     st.write("**Matched Skills:**")
@@ -652,9 +846,13 @@ def show_generate_cv_page():
                     with st.spinner("Generating your ATS-optimized CV... This may take up to 30 seconds."):
                         result = api_client.generate_cv(job_description)
                     
+                    _clear_cv_caches()
                     st.success(f"✅ CV Generated! ATS Score: {result.get('ats_score', 0)}%")
-                    
-                    # Store result and navigate
+
+                    # Store result and navigate. The generate response is
+                    # the full CV record, so seeding it here lets the view
+                    # page skip its follow-up GET entirely.
+                    st.session_state["_cv_cache"] = {result.get("_id"): result}
                     st.session_state["selected_cv"] = result.get("_id")
                     st.session_state["current_page"] = "view_cv"
                     st.rerun()
@@ -663,19 +861,189 @@ def show_generate_cv_page():
                     st.error(f"Generation failed: {str(e)}")
 
 
+@st.fragment
+def _latex_tab_fragment(cv):
+    """LaTeX source tab body."""
+    st.subheader("LaTeX Source Code")
+    st.info("You can copy and modify this LaTeX code as needed.")
+    
+    latex_code = cv.get("latex_code", "")
+    st.code(latex_code, language="latex")
+    
+    st.download_button(
+        label="📄 Download LaTeX (.tex)",
+        data=latex_code,
+        file_name="cv.tex",
+        mime="text/plain",
+        use_container_width=True
+    )
+
+
+
+# Background render bookkeeping, keyed by (cv_id, fmt) in session state.
+_RENDER_JOBS_KEY = "render_jobs"
+_RENDER_DONE_KEY = "render_results"
+
+_RENDER_FORMATS = {
+    "pdf": {
+        "button": "📄 Download PDF",
+        "save": "💾 Save PDF",
+        "file_name": "cv.pdf",
+        "mime": "application/pdf",
+        "spinner": "Compiling PDF...",
+        "error": "PDF generation failed",
+        "tip": "Tip: Make sure LaTeX (pdflatex/xelatex) is installed on the server.",
+        "fetch": cached_pdf,
+    },
+    "docx": {
+        "button": "📝 Download DOCX",
+        "save": "💾 Save DOCX",
+        "file_name": "cv.docx",
+        "mime": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "spinner": "Converting to DOCX...",
+        "error": "DOCX conversion failed",
+        "tip": "Tip: Make sure Pandoc is installed on the server.",
+        "fetch": cached_docx,
+    },
+}
+
+
+@st.fragment(run_every=1.0)
+def _render_poll_fragment(cv_id, fmt):
+    """Poll a background render job once a second until it finishes."""
+    jobs = st.session_state.get(_RENDER_JOBS_KEY, {})
+    task_id = jobs.get((cv_id, fmt))
+    if not task_id:
+        st.rerun(scope="app")
+
+    done = st.session_state.setdefault(_RENDER_DONE_KEY, {})
+    try:
+        task_status = api_client.poll_render(task_id)
+    except Exception as e:
+        jobs.pop((cv_id, fmt), None)
+        done[(cv_id, fmt)] = {"error": str(e)}
+        st.rerun(scope="app")
+
+    if not task_status.get("ready"):
+        st.caption(f"⏳ Rendering {fmt.upper()} on the server...")
+        return
+
+    jobs.pop((cv_id, fmt), None)
+    if task_status.get("successful") is False:
+        done[(cv_id, fmt)] = {"error": "Render task failed"}
+    else:
+        try:
+            done[(cv_id, fmt)] = {"bytes": api_client.download_render(task_id, fmt).getvalue()}
+        except Exception as e:
+            done[(cv_id, fmt)] = {"error": str(e)}
+    st.rerun(scope="app")
+
+
+def _render_download_column(cv_id, fmt):
+    """One download column: start a render, poll it, then offer the bytes."""
+    spec = _RENDER_FORMATS[fmt]
+    key = (cv_id, fmt)
+
+    if st.session_state.get(_RENDER_JOBS_KEY, {}).get(key):
+        _render_poll_fragment(cv_id, fmt)
+        return
+
+    done = st.session_state.get(_RENDER_DONE_KEY, {}).get(key)
+    if done and "bytes" in done:
+        st.download_button(
+            label=spec["save"],
+            data=done["bytes"],
+            file_name=spec["file_name"],
+            mime=spec["mime"],
+            use_container_width=True,
+            key=f"save_{fmt}_{cv_id}"
+        )
+        return
+    if done and "error" in done:
+        st.error(f"{spec['error']}: {done['error']}")
+        st.info(spec["tip"])
+
+    if st.button(
+        spec["button"],
+        use_container_width=True,
+        type="primary" if fmt == "pdf" else "secondary",
+        key=f"render_{fmt}_{cv_id}"
+    ):
+        results = st.session_state.setdefault(_RENDER_DONE_KEY, {})
+        results.pop(key, None)
+        try:
+            job = api_client.start_render(cv_id, fmt)
+        except Exception as e:
+            results[key] = {"error": str(e)}
+            st.rerun(scope="fragment")
+
+        if job.get("task_id"):
+            # Worker pool available: fire and poll, UI stays interactive.
+            st.session_state.setdefault(_RENDER_JOBS_KEY, {})[key] = job["task_id"]
+        else:
+            # Sync backend (no Celery workers): blocking compile, memoized.
+            try:
+                with st.spinner(spec["spinner"]):
+                    results[key] = {"bytes": spec["fetch"](_current_user_id(), cv_id)}
+            except Exception as e:
+                results[key] = {"error": str(e)}
+        st.rerun(scope="fragment")
+
+
+@st.fragment
+def _download_tab_fragment(cv_id):
+    """Download tab body; renders run server-side and are polled, not awaited."""
+    st.subheader("Download Options")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**PDF Download**")
+        st.write("Best for applications and printing")
+        _render_download_column(cv_id, "pdf")
+
+    with col2:
+        st.write("**DOCX Download**")
+        st.write("Editable in Microsoft Word")
+        _render_download_column(cv_id, "docx")
+
+
+
+@st.fragment
+def _details_tab_fragment(cv):
+    """Details tab body."""
+    st.subheader("CV Details")
+    
+    score = cv.get("ats_score", 0)
+    
+    st.write(f"**Created:** {cv.get('created_at', '')[:19]}")
+    st.write(f"**ATS Score:** {score}%")
+    
+    st.write("**Aligned Skills:**")
+    skills = cv.get("aligned_skills", [])
+    if skills:
+        st.write(", ".join(skills))
+    else:
+        st.write("No specific skill alignment recorded")
+    
+    st.write("**Job Description:**")
+    st.text_area("JD", value=cv.get("job_description", ""), height=200, disabled=True)
+
+
+
 def show_view_cv_page():
     """Display CV view page with LaTeX preview and downloads."""
     cv_id = st.session_state.get("selected_cv")
     
     if not cv_id:
         st.warning("No CV selected")
-        if st.button("Go to History"):
-            st.session_state["current_page"] = "history"
-            st.rerun()
+        st.button("Go to History", on_click=_go_to, args=("history",))
         return
     
     try:
-        cv = api_client.get_cv(cv_id)
+        # Freshly generated CVs are seeded into session state by the
+        # generate page; anything else falls back to the cached GET.
+        cv = st.session_state.get("_cv_cache", {}).get(cv_id) or cached_get_cv(_current_user_id(), cv_id)
     except Exception as e:
         st.error(f"Error loading CV: {str(e)}")
         return
@@ -684,107 +1052,39 @@ def show_view_cv_page():
     
     # ATS Score display
     score = cv.get("ats_score", 0)
-    score_class = "high" if score >= 90 else "medium" if score >= 70 else "low"
-    
+
     col1, col2, col3 = st.columns([1, 2, 1])
-    
+
     with col2:
-        st.markdown(f'<p class="ats-score ats-score-{score_class}">ATS Score: {score}%</p>', unsafe_allow_html=True)
+        st.markdown(_SCORE_HTML[_score_class(score)].format(f"ATS Score: {score}%"), unsafe_allow_html=True)
     
     st.divider()
     
     # Tabs for different views
     tab1, tab2, tab3 = st.tabs(["📝 LaTeX Code", "📥 Download", "ℹ️ Details"])
     
+    # Fragment per tab: clicks inside one tab rerun only that tab
     with tab1:
-        st.subheader("LaTeX Source Code")
-        st.info("You can copy and modify this LaTeX code as needed.")
-        
-        latex_code = cv.get("latex_code", "")
-        st.code(latex_code, language="latex")
-        
-        st.download_button(
-            label="📄 Download LaTeX (.tex)",
-            data=latex_code,
-            file_name="cv.tex",
-            mime="text/plain",
-            use_container_width=True
-        )
+        _latex_tab_fragment(cv)
     
     with tab2:
-        st.subheader("Download Options")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**PDF Download**")
-            st.write("Best for applications and printing")
-            
-            if st.button("📄 Download PDF", use_container_width=True, type="primary"):
-                try:
-                    with st.spinner("Compiling PDF..."):
-                        pdf_content = api_client.download_pdf(cv_id)
-                    
-                    st.download_button(
-                        label="💾 Save PDF",
-                        data=pdf_content,
-                        file_name="cv.pdf",
-                        mime="application/pdf",
-                        use_container_width=True
-                    )
-                except Exception as e:
-                    st.error(f"PDF generation failed: {str(e)}")
-                    st.info("Tip: Make sure LaTeX (pdflatex/xelatex) is installed on the server.")
-        
-        with col2:
-            st.write("**DOCX Download**")
-            st.write("Editable in Microsoft Word")
-            
-            if st.button("📝 Download DOCX", use_container_width=True):
-                try:
-                    with st.spinner("Converting to DOCX..."):
-                        docx_content = api_client.download_docx(cv_id)
-                    
-                    st.download_button(
-                        label="💾 Save DOCX",
-                        data=docx_content,
-                        file_name="cv.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        use_container_width=True
-                    )
-                except Exception as e:
-                    st.error(f"DOCX conversion failed: {str(e)}")
-                    st.info("Tip: Make sure Pandoc is installed on the server.")
+        _download_tab_fragment(cv_id)
     
     with tab3:
-        st.subheader("CV Details")
-        
-        st.write(f"**Created:** {cv.get('created_at', '')[:19]}")
-        st.write(f"**ATS Score:** {score}%")
-        
-        st.write("**Aligned Skills:**")
-        skills = cv.get("aligned_skills", [])
-        if skills:
-            st.write(", ".join(skills))
-        else:
-            st.write("No specific skill alignment recorded")
-        
-        st.write("**Job Description:**")
-        st.text_area("JD", value=cv.get("job_description", ""), height=200, disabled=True)
+        _details_tab_fragment(cv)
     
     st.divider()
     
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("⬅️ Back to History", use_container_width=True):
-            st.session_state["current_page"] = "history"
-            st.rerun()
+        st.button("⬅️ Back to History", use_container_width=True, on_click=_go_to, args=("history",))
     
     with col2:
         if st.button("🗑️ Delete this CV", use_container_width=True):
             try:
                 api_client.delete_cv(cv_id)
+                _clear_cv_caches()
                 st.success("CV deleted!")
                 st.session_state["current_page"] = "history"
                 st.rerun()
@@ -792,65 +1092,124 @@ def show_view_cv_page():
                 st.error(str(e))
 
 
+_HISTORY_PAGE_SIZE = 10
+
+
+def _set_history_page(page: int) -> None:
+    """Pagination callback for the history Prev/Next controls."""
+    st.session_state["history_page"] = page
+
+
 def show_history_page():
     """Display CV history page."""
     st.header("📜 CV Generation History")
     
-    try:
-        history = api_client.get_cv_history(limit=50)
-    except Exception as e:
-        st.error(f"Error loading history: {str(e)}")
-        return
+    # A delete handler may have stashed the already-refreshed list;
+    # consume it once instead of refetching into the cleared cache.
+    history = st.session_state.pop("_history_refresh", None)
+    if history is None:
+        try:
+            history = cached_cv_history(_current_user_id(), limit=50)
+        except Exception as e:
+            st.error(f"Error loading history: {str(e)}")
+            return
     
     if not history:
         st.info("You haven't generated any CVs yet.")
-        if st.button("Generate Your First CV", use_container_width=True):
-            st.session_state["current_page"] = "generate"
-            st.rerun()
+        st.button("Generate Your First CV", use_container_width=True, on_click=_go_to, args=("generate",))
         return
-    
-    for cv in history:
-        score = cv.get("ats_score", 0)
-        score_emoji = "🟢" if score >= 90 else "🟡" if score >= 70 else "🔴"
-        
-        with st.expander(f"{score_emoji} ATS Score: {score}% | {cv.get('created_at', '')[:10]}"):
-            st.write(f"**Job Description Preview:**")
-            jd = cv.get("job_description", "")
-            st.text(jd[:300] + "..." if len(jd) > 300 else jd)
-            
-            st.write(f"**Aligned Skills:** {', '.join(cv.get('aligned_skills', [])[:5])}")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                if st.button("👁️ View", key=f"view_{cv['_id']}"):
-                    st.session_state["selected_cv"] = cv["_id"]
-                    st.session_state["current_page"] = "view_cv"
-                    st.rerun()
-            
-            with col2:
-                if st.button("📄 Download PDF", key=f"pdf_{cv['_id']}"):
-                    try:
-                        with st.spinner("Generating PDF..."):
-                            pdf_content = api_client.download_pdf(cv["_id"])
-                        st.download_button(
-                            label="💾 Save",
-                            data=pdf_content,
-                            file_name=f"cv_{cv['_id'][:8]}.pdf",
-                            mime="application/pdf",
-                            key=f"save_pdf_{cv['_id']}"
-                        )
-                    except Exception as e:
-                        st.error(str(e))
-            
-            with col3:
-                if st.button("🗑️ Delete", key=f"del_{cv['_id']}"):
-                    try:
-                        api_client.delete_cv(cv["_id"])
-                        st.success("Deleted!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(str(e))
+
+    # Paginate so a rerun registers ~10 rows of widgets, not 50.
+    total_pages = (len(history) + _HISTORY_PAGE_SIZE - 1) // _HISTORY_PAGE_SIZE
+    page = min(st.session_state.get("history_page", 0), total_pages - 1)
+
+    start = page * _HISTORY_PAGE_SIZE
+    for cv in history[start:start + _HISTORY_PAGE_SIZE]:
+        _history_row_fragment(cv)
+
+    if total_pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button(
+                "⬅️ Prev",
+                use_container_width=True,
+                disabled=page == 0,
+                on_click=_set_history_page,
+                args=(page - 1,)
+            )
+        with col2:
+            st.caption(f"Page {page + 1} of {total_pages}")
+        with col3:
+            st.button(
+                "Next ➡️",
+                use_container_width=True,
+                disabled=page >= total_pages - 1,
+                on_click=_set_history_page,
+                args=(page + 1,)
+            )
+
+
+@st.fragment
+def _history_row_fragment(cv):
+    """One history row; downloads rerun only this row, not the whole page.
+
+    Navigation and delete need the surrounding page to react, so those
+    handlers escalate with st.rerun(scope="app") — on_click callbacks
+    inside a fragment would otherwise rerun just the fragment.
+    """
+    score = cv.get("ats_score", 0)
+
+    with st.expander(f"{cv['_emoji']} ATS Score: {score}% | {cv.get('created_at', '')[:10]}"):
+        st.write(f"**Job Description Preview:**")
+        st.text(cv["_jd_preview"])
+
+        st.write(f"**Aligned Skills:** {cv['_skills_preview']}")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            if st.button("👁️ View", key=f"view_{cv['_id']}"):
+                _go_to("view_cv", cv["_id"])
+                st.rerun(scope="app")
+
+        with col2:
+            if st.button("📄 Download PDF", key=f"pdf_{cv['_id']}"):
+                try:
+                    with st.spinner("Generating PDF..."):
+                        pdf_content = cached_pdf(_current_user_id(), cv["_id"])
+                    st.download_button(
+                        label="💾 Save",
+                        data=pdf_content,
+                        file_name=f"cv_{cv['_id'][:8]}.pdf",
+                        mime="application/pdf",
+                        key=f"save_pdf_{cv['_id']}"
+                    )
+                except Exception as e:
+                    st.error(str(e))
+
+        with col3:
+            if st.button("🗑️ Delete", key=f"del_{cv['_id']}"):
+                try:
+                    # One composite call: the delete response carries the
+                    # refreshed list, so the post-delete rerun skips its
+                    # history fetch.
+                    refreshed = api_client.delete_cv(cv["_id"], history_limit=50)
+                    _clear_cv_caches()
+                    st.session_state["_history_refresh"] = _annotate_history(refreshed.get("history", []))
+                    st.success("Deleted!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(str(e))
+
+
+# Page key -> renderer; one dict lookup per rerun instead of an if/elif chain
+_PAGES = {
+    "dashboard": show_dashboard,
+    "profile": show_profile_page,
+    "generate": show_generate_cv_page,
+    "history": show_history_page,
+    "view_cv": show_view_cv_page,
+}
 
 
 def main():
@@ -859,26 +1218,13 @@ def main():
     if not api_client.is_authenticated():
         show_login_page()
         return
-    
+
     # Show sidebar
     show_sidebar()
-    
-    # Get current page
-    current_page = st.session_state.get("current_page", "dashboard")
-    
+
     # Route to appropriate page
-    if current_page == "dashboard":
-        show_dashboard()
-    elif current_page == "profile":
-        show_profile_page()
-    elif current_page == "generate":
-        show_generate_cv_page()
-    elif current_page == "history":
-        show_history_page()
-    elif current_page == "view_cv":
-        show_view_cv_page()
-    else:
-        show_dashboard()
+    current_page = st.session_state.get("current_page", "dashboard")
+    _PAGES.get(current_page, show_dashboard)()
 
 
 if __name__ == "__main__":
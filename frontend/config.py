@@ -2,36 +2,41 @@
 Streamlit Frontend Configuration
 """
 import os
+import functools
 from dataclasses import dataclass
 
 # Try to get from Streamlit secrets first, then environment variable
+@functools.lru_cache(maxsize=1)
 def get_api_url():
     try:
         import streamlit as st
         return st.secrets.get("API_BASE_URL", os.getenv("API_BASE_URL", "http://localhost:8000/api/v1"))
-    except:
+    except Exception:
+        # st.secrets raises when no secrets file exists; Exception (not a
+        # bare except) keeps KeyboardInterrupt/SystemExit propagating.
         return os.getenv("API_BASE_URL", "http://localhost:8000/api/v1")
 
 
-@dataclass
+# Resolved once at import; st.secrets access parses TOML on first touch,
+# so it should not run again on every Config() construction.
+_API_URL = get_api_url()
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Frontend configuration."""
-    API_BASE_URL: str = None
+    """Frontend configuration (immutable; attribute reads hit slots)."""
+    API_BASE_URL: str = _API_URL
     APP_TITLE: str = "ATS CV Generator"
     APP_ICON: str = "📄"
-    
+
     # Session config
     TOKEN_KEY: str = "auth_token"
     REFRESH_TOKEN_KEY: str = "refresh_token"
     USER_KEY: str = "user"
-    
+
     # Page config
     PAGE_TITLE: str = "ATS CV Generator"
     LAYOUT: str = "wide"
-    
-    def __post_init__(self):
-        if self.API_BASE_URL is None:
-            self.API_BASE_URL = get_api_url()
 
 
 config = Config()